@@ -69,7 +69,12 @@ class RubberBandSelector(QtCore.QObject):
 
 
 class SelectionManager(QtCore.QObject):
-    """Manages item selection with rubber band support"""
+    """Manages item selection with rubber band support
+    
+    Selection state lives in the canvas scene (QGraphicsItem.isSelected /
+    QGraphicsScene.selectedItems); this class drives it and re-emits the
+    scene's selectionChanged with the selected items.
+    """
     
     # Signals
     selection_changed = Signal(list)  # List of selected items
@@ -78,69 +83,72 @@ class SelectionManager(QtCore.QObject):
         super(SelectionManager, self).__init__()
         self.canvas_widget = canvas_widget
         self.rubber_band = RubberBandSelector(canvas_widget)
-        self.selected_items = []
         self.last_selected_item = None
         
         # Connect rubber band signals
         self.rubber_band.selection_finished.connect(self._on_rubber_band_selection)
         
+        # Forward scene selection changes
+        self._scene = canvas_widget.scene()
+        self._scene.selectionChanged.connect(self._on_scene_selection_changed)
+        
+    def _on_scene_selection_changed(self):
+        """Emit selection_changed with the scene's selected items"""
+        self.selection_changed.emit(self._scene.selectedItems())
+        
     def select_item(self, item, multi_select=False):
         """Select a single item"""
-        if not multi_select:
-            self.clear_selection()
-            
-        if item not in self.selected_items:
-            self.selected_items.append(item)
-            item.set_selected(True)
+        if multi_select:
+            item.setSelected(True)
             self.last_selected_item = item
-            
-        self.selection_changed.emit(self.selected_items[:])
+        else:
+            self.select_items((item,))
         
     def deselect_item(self, item):
         """Deselect a single item"""
-        if item in self.selected_items:
-            self.selected_items.remove(item)
-            item.set_selected(False)
-            
-            if self.last_selected_item == item:
-                self.last_selected_item = self.selected_items[-1] if self.selected_items else None
-                
-        self.selection_changed.emit(self.selected_items[:])
+        item.setSelected(False)
         
+        if self.last_selected_item is item:
+            selected_items = self._scene.selectedItems()
+            self.last_selected_item = selected_items[-1] if selected_items else None
+            
     def toggle_item_selection(self, item):
         """Toggle item selection state"""
-        if item in self.selected_items:
+        if item.isSelected():
             self.deselect_item(item)
         else:
             self.select_item(item, multi_select=True)
             
     def select_items(self, items, multi_select=False):
         """Select multiple items"""
-        if not multi_select:
-            self.clear_selection()
+        scene = self._scene
+        blocked = scene.blockSignals(True)
+        try:
+            if not multi_select:
+                scene.clearSelection()
+            for item in items:
+                item.setSelected(True)
+        finally:
+            scene.blockSignals(blocked)
             
-        for item in items:
-            if item not in self.selected_items:
-                self.selected_items.append(item)
-                item.set_selected(True)
-                
         if items:
             self.last_selected_item = items[-1]
             
-        self.selection_changed.emit(self.selected_items[:])
+        if not blocked:
+            self._on_scene_selection_changed()
         
     def clear_selection(self):
         """Clear all selection"""
-        for item in self.selected_items:
-            item.set_selected(False)
-            
-        self.selected_items.clear()
         self.last_selected_item = None
-        self.selection_changed.emit([])
+        self._scene.clearSelection()
         
     def get_selected_items(self):
         """Get list of selected items"""
-        return self.selected_items[:]
+        return self._scene.selectedItems()
+        
+    def is_selected(self, item):
+        """Check if an item is selected"""
+        return item.isSelected()
         
     def get_last_selected_item(self):
         """Get the last selected item"""
@@ -148,7 +156,7 @@ class SelectionManager(QtCore.QObject):
         
     def has_selection(self):
         """Check if any items are selected"""
-        return len(self.selected_items) > 0
+        return bool(self._scene.selectedItems())
         
     def start_rubber_band_selection(self, point):
         """Start rubber band selection"""
@@ -183,6 +191,10 @@ class SelectionManager(QtCore.QObject):
             
     def _find_items_in_rect(self, rect):
         """Find items that intersect with the given rectangle"""
+        # Let the canvas answer from its spatial index when it has one
+        if hasattr(self.canvas_widget, 'get_items_in_rect'):
+            return self.canvas_widget.get_items_in_rect(rect)
+            
         intersecting_items = []
         
         # Get all items from the canvas
@@ -199,17 +211,18 @@ class SelectionManager(QtCore.QObject):
         
     def select_all(self):
         """Select all items on canvas"""
-        if hasattr(self.canvas_widget, 'get_all_items'):
-            all_items = self.canvas_widget.get_all_items()
-            self.select_items(all_items)
+        # One selection-area pass in the scene instead of per-item calls
+        scene = self._scene
+        path = QtGui.QPainterPath()
+        path.addRect(scene.sceneRect())
+        scene.setSelectionArea(path)
             
     def invert_selection(self):
         """Invert current selection"""
         if hasattr(self.canvas_widget, 'get_all_items'):
             all_items = self.canvas_widget.get_all_items()
-            unselected_items = [item for item in all_items if item not in self.selected_items]
+            unselected_items = [item for item in all_items if not item.isSelected()]
             
-            self.clear_selection()
             self.select_items(unselected_items)
 
 
@@ -8,9 +8,17 @@ from PySide2 import QtWidgets, QtCore, QtGui
 from PySide2.QtCore import Signal
 import json
 
+# Item capability flags, read by menus instead of probing with hasattr
+CAP_TEXT = 1
+CAP_COMMAND = 2
+CAP_POSE = 4
+CAP_ZORDER = 8
+
 class BasePickerItem(QtWidgets.QGraphicsObject):
     """Base class for all picker items"""
     
+    CAPS = CAP_TEXT | CAP_COMMAND | CAP_ZORDER
+    
     # Signals
     clicked = Signal()
     double_clicked = Signal()
@@ -116,6 +124,11 @@ class BasePickerItem(QtWidgets.QGraphicsObject):
             except Exception as e:
                 print(f"Error executing MEL command: {e}")
                 
+    def _use_antialiasing(self, widget):
+        """Check whether to antialias, skipping it while the view is navigated"""
+        is_navigating = getattr(widget.parent(), 'is_navigating', None) if widget is not None else None
+        return not (is_navigating and is_navigating())
+        
     def get_current_colors(self):
         """Get current colors based on state"""
         if self._is_selected:
@@ -50,7 +50,7 @@ class CheckboxItem(BasePickerItem):
         
     def paint(self, painter, option, widget):
         """Paint the checkbox"""
-        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        painter.setRenderHint(QtGui.QPainter.Antialiasing, self._use_antialiasing(widget))
         
         rect = self.boundingRect()
         
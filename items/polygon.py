@@ -67,7 +67,7 @@ class PolygonItem(BasePickerItem):
             return
             
         # Set up painter
-        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        painter.setRenderHint(QtGui.QPainter.Antialiasing, self._use_antialiasing(widget))
         
         # Create polygon from points
         polygon = QtGui.QPolygonF(self._points)
@@ -11,7 +11,7 @@ from io import BytesIO
 import maya.cmds as cmds
 import maya.OpenMayaUI as omui
 from PySide2 import QtWidgets, QtCore, QtGui
-from .base_item import BasePickerItem
+from .base_item import BasePickerItem, CAP_POSE
 
 try:
     import shiboken2
@@ -21,6 +21,8 @@ except ImportError:
 class PoseButtonItem(BasePickerItem):
     """Pose button with thumbnail and pose storage"""
     
+    CAPS = BasePickerItem.CAPS | CAP_POSE
+    
     # Signals
     pose_applied = QtCore.Signal(str)  # pose name
     thumbnail_captured = QtCore.Signal()
@@ -59,7 +61,7 @@ class PoseButtonItem(BasePickerItem):
         
     def paint(self, painter, option, widget):
         """Paint the pose button"""
-        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        painter.setRenderHint(QtGui.QPainter.Antialiasing, self._use_antialiasing(widget))
         
         rect = self.boundingRect()
         
@@ -69,7 +69,7 @@ class RadiusButtonItem(BasePickerItem):
         
     def paint(self, painter, option, widget):
         """Paint the radius button"""
-        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        painter.setRenderHint(QtGui.QPainter.Antialiasing, self._use_antialiasing(widget))
         
         # Draw guide circle (max radius)
         if self._max_radius > self._current_radius:
@@ -33,7 +33,7 @@ class RectangleItem(BasePickerItem):
         bg_color, border_color, text_color = self.get_current_colors()
         
         # Setup painter
-        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        painter.setRenderHint(QtGui.QPainter.Antialiasing, self._use_antialiasing(widget))
         
         # Draw background
         painter.setBrush(QtGui.QBrush(bg_color))
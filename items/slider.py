@@ -56,7 +56,7 @@ class SliderItem(BasePickerItem):
         
     def paint(self, painter, option, widget):
         """Paint the slider"""
-        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        painter.setRenderHint(QtGui.QPainter.Antialiasing, self._use_antialiasing(widget))
         
         rect = self.boundingRect()
         
@@ -62,8 +62,9 @@ class TextItem(BasePickerItem):
         
     def paint(self, painter, option, widget):
         """Paint the text item"""
-        painter.setRenderHint(QtGui.QPainter.Antialiasing)
-        painter.setRenderHint(QtGui.QPainter.TextAntialiasing)
+        smooth = self._use_antialiasing(widget)
+        painter.setRenderHint(QtGui.QPainter.Antialiasing, smooth)
+        painter.setRenderHint(QtGui.QPainter.TextAntialiasing, smooth)
         
         rect = self.boundingRect()
         
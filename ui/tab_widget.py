@@ -7,6 +7,17 @@ Implements main tabs and subtabs with comprehensive management
 from PySide2 import QtWidgets, QtCore, QtGui
 from PySide2.QtCore import Signal
 
+# Object name shared by the "+" buttons; one stylesheet on the tab widget
+# styles both, so it is parsed once instead of once per button
+ADD_TAB_BUTTON_OBJECT_NAME = "UAPAddTabButton"
+
+_TAB_WIDGET_QSS = """
+    QPushButton#UAPAddTabButton {
+        font-weight: bold;
+        font-size: 12px;
+    }
+"""
+
 class CustomTabBar(QtWidgets.QTabBar):
     """Custom tab bar with right-click context menu support"""
     
@@ -54,6 +65,14 @@ class TabContextMenu(QtWidgets.QMenu):
         self.can_delete = can_delete
         
         self.setup_menu()
+        self.refresh(tab_index, can_delete)
+        
+    def refresh(self, tab_index, can_delete=True):
+        """Retarget the menu at a tab before showing it again"""
+        self.tab_index = tab_index
+        self.can_delete = can_delete
+        self._delete_action.setEnabled(can_delete)
+        self._delete_action.setToolTip("" if can_delete else "Cannot delete the last tab")
         
     def setup_menu(self):
         """Setup context menu actions"""
@@ -78,13 +97,9 @@ class TabContextMenu(QtWidgets.QMenu):
         
         self.addSeparator()
         
-        # Delete action
-        delete_action = self.addAction("Delete")
-        delete_action.setEnabled(self.can_delete)
-        delete_action.triggered.connect(lambda: self.delete_requested.emit(self.tab_index))
-        
-        if not self.can_delete:
-            delete_action.setToolTip("Cannot delete the last tab")
+        # Delete action, enabled state set by refresh()
+        self._delete_action = self.addAction("Delete")
+        self._delete_action.triggered.connect(lambda: self.delete_requested.emit(self.tab_index))
 
 
 class EnhancedTabWidget(QtWidgets.QWidget):
@@ -105,6 +120,10 @@ class EnhancedTabWidget(QtWidgets.QWidget):
         self._current_main_tab = -1
         self._current_sub_tab = -1
         
+        # Context menus, built and connected on first use then reused
+        self._main_tab_menu = None
+        self._sub_tab_menu = None
+        
         self.setup_ui()
         self.connect_signals()
         
@@ -113,6 +132,7 @@ class EnhancedTabWidget(QtWidgets.QWidget):
         layout = QtWidgets.QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
         layout.setSpacing(2)
+        self.setStyleSheet(_TAB_WIDGET_QSS)
         
         # Main tabs section
         main_tab_layout = QtWidgets.QHBoxLayout()
@@ -130,12 +150,7 @@ class EnhancedTabWidget(QtWidgets.QWidget):
         self.add_main_tab_btn.setMaximumSize(25, 25)
         self.add_main_tab_btn.setMinimumSize(25, 25)
         self.add_main_tab_btn.setToolTip("Add Main Tab")
-        self.add_main_tab_btn.setStyleSheet("""
-            QPushButton {
-                font-weight: bold;
-                font-size: 12px;
-            }
-        """)
+        self.add_main_tab_btn.setObjectName(ADD_TAB_BUTTON_OBJECT_NAME)
         main_tab_layout.addWidget(self.add_main_tab_btn)
         
         main_tab_layout.addStretch()
@@ -157,12 +172,7 @@ class EnhancedTabWidget(QtWidgets.QWidget):
         self.add_sub_tab_btn.setMaximumSize(25, 25)
         self.add_sub_tab_btn.setMinimumSize(25, 25)
         self.add_sub_tab_btn.setToolTip("Add Sub Tab")
-        self.add_sub_tab_btn.setStyleSheet("""
-            QPushButton {
-                font-weight: bold;
-                font-size: 12px;
-            }
-        """)
+        self.add_sub_tab_btn.setObjectName(ADD_TAB_BUTTON_OBJECT_NAME)
         sub_tab_layout.addWidget(self.add_sub_tab_btn)
         
         sub_tab_layout.addStretch()
@@ -307,14 +317,19 @@ class EnhancedTabWidget(QtWidgets.QWidget):
     def show_main_tab_context_menu(self, tab_index, global_pos):
         """Show context menu for main tab"""
         can_delete = len(self._main_tabs) > 1
-        menu = TabContextMenu(tab_index, is_main_tab=True, can_delete=can_delete, parent=self)
-        
-        # Connect signals
-        menu.rename_requested.connect(self.rename_main_tab)
-        menu.delete_requested.connect(self.delete_main_tab)
-        menu.duplicate_requested.connect(self.duplicate_main_tab)
-        menu.move_left_requested.connect(self.move_main_tab_left)
-        menu.move_right_requested.connect(self.move_main_tab_right)
+        menu = self._main_tab_menu
+        if menu is None:
+            menu = TabContextMenu(tab_index, is_main_tab=True, can_delete=can_delete, parent=self)
+            
+            # Connect signals once; reuse only retargets the menu
+            menu.rename_requested.connect(self.rename_main_tab)
+            menu.delete_requested.connect(self.delete_main_tab)
+            menu.duplicate_requested.connect(self.duplicate_main_tab)
+            menu.move_left_requested.connect(self.move_main_tab_left)
+            menu.move_right_requested.connect(self.move_main_tab_right)
+            self._main_tab_menu = menu
+        else:
+            menu.refresh(tab_index, can_delete)
         
         menu.exec_(global_pos)
         
@@ -326,14 +341,19 @@ class EnhancedTabWidget(QtWidgets.QWidget):
         main_tab_name = self._main_tabs[self._current_main_tab]
         can_delete = len(self._sub_tabs.get(main_tab_name, [])) > 1
         
-        menu = TabContextMenu(tab_index, is_main_tab=False, can_delete=can_delete, parent=self)
-        
-        # Connect signals
-        menu.rename_requested.connect(self.rename_sub_tab)
-        menu.delete_requested.connect(self.delete_sub_tab)
-        menu.duplicate_requested.connect(self.duplicate_sub_tab)
-        menu.move_left_requested.connect(self.move_sub_tab_left)
-        menu.move_right_requested.connect(self.move_sub_tab_right)
+        menu = self._sub_tab_menu
+        if menu is None:
+            menu = TabContextMenu(tab_index, is_main_tab=False, can_delete=can_delete, parent=self)
+            
+            # Connect signals once; reuse only retargets the menu
+            menu.rename_requested.connect(self.rename_sub_tab)
+            menu.delete_requested.connect(self.delete_sub_tab)
+            menu.duplicate_requested.connect(self.duplicate_sub_tab)
+            menu.move_left_requested.connect(self.move_sub_tab_left)
+            menu.move_right_requested.connect(self.move_sub_tab_right)
+            self._sub_tab_menu = menu
+        else:
+            menu.refresh(tab_index, can_delete)
         
         menu.exec_(global_pos)
         
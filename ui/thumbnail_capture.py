@@ -7,6 +7,8 @@ Captures Maya viewport thumbnails for pose buttons and other items
 import os
 import tempfile
 import base64
+import zipfile
+from collections import OrderedDict
 from io import BytesIO
 import maya.cmds as cmds
 import maya.OpenMayaUI as omui
@@ -55,8 +57,9 @@ class ThumbnailCapture(QtCore.QObject):
             temp_filename = os.path.join(self._temp_dir, f"picker_thumb_{timestamp}")
             
             # Capture viewport using playblast
+            frame = cmds.currentTime(query=True)
             result = cmds.playblast(
-                frame=cmds.currentTime(query=True),
+                frame=frame,
                 format='image',
                 filename=temp_filename,
                 widthHeight=[size.width(), size.height()],
@@ -65,12 +68,12 @@ class ThumbnailCapture(QtCore.QObject):
                 viewer=False,
                 showOrnaments=False,
                 compression='png',
-                startTime=cmds.currentTime(query=True),
-                endTime=cmds.currentTime(query=True)
+                startTime=frame,
+                endTime=frame
             )
             
             # The actual filename includes frame number
-            actual_filename = f"{temp_filename}.{int(cmds.currentTime(query=True)):04d}.png"
+            actual_filename = f"{temp_filename}.{int(frame):04d}.png"
             
             if os.path.exists(actual_filename):
                 # Convert to base64
@@ -116,22 +119,31 @@ class ThumbnailCapture(QtCore.QObject):
             size = self._default_size
             
         try:
-            # Create pixmap from widget
-            pixmap = widget.grab()
-            
-            if not pixmap.isNull():
-                # Scale to desired size
-                scaled_pixmap = pixmap.scaled(
-                    size,
-                    QtCore.Qt.KeepAspectRatio,
-                    QtCore.Qt.SmoothTransformation
-                )
+            widget_size = widget.size()
+            if widget_size.isEmpty():
+                self.capture_failed.emit("Failed to capture widget")
+                return False
                 
-                # Convert to base64
-                base64_data = self.pixmap_to_base64(scaled_pixmap)
-                if base64_data:
-                    self.capture_completed.emit(base64_data)
-                    return True
+            # Render straight into an image at the target size instead of
+            # grabbing a full-size pixmap and scaling it down afterwards
+            target_size = widget_size.scaled(size, QtCore.Qt.KeepAspectRatio)
+            image = QtGui.QImage(target_size, QtGui.QImage.Format_ARGB32_Premultiplied)
+            image.fill(0)
+            
+            painter = QtGui.QPainter(image)
+            painter.setRenderHint(QtGui.QPainter.SmoothPixmapTransform)
+            painter.scale(
+                target_size.width() / float(widget_size.width()),
+                target_size.height() / float(widget_size.height())
+            )
+            widget.render(painter)
+            painter.end()
+            
+            # Convert to base64
+            base64_data = self.qimage_to_base64(image)
+            if base64_data:
+                self.capture_completed.emit(base64_data)
+                return True
                     
             self.capture_failed.emit("Failed to capture widget")
             return False
@@ -161,6 +173,19 @@ class ThumbnailCapture(QtCore.QObject):
             print(f"Error converting pixmap to base64: {e}")
         return None
         
+    def qimage_to_base64(self, image):
+        """Convert QImage to base64 string"""
+        try:
+            byte_array = QtCore.QByteArray()
+            buffer = QtCore.QBuffer(byte_array)
+            buffer.open(QtCore.QIODevice.WriteOnly)
+            image.save(buffer, "PNG")
+            buffer.close()
+            return base64.b64encode(byte_array.data()).decode('utf-8')
+        except Exception as e:
+            print(f"Error converting image to base64: {e}")
+        return None
+        
     def base64_to_pixmap(self, base64_data):
         """Convert base64 string to QPixmap"""
         try:
@@ -187,6 +212,14 @@ class ThumbnailCaptureDialog(QtWidgets.QDialog):
     # Signals
     thumbnail_captured = Signal(str)  # base64 data
     
+    # Thumbnail sizes, in size_combo order
+    _SIZES = (
+        QtCore.QSize(64, 64),
+        QtCore.QSize(128, 128),
+        QtCore.QSize(256, 256),
+        QtCore.QSize(512, 512)
+    )
+    
     def __init__(self, parent=None):
         super(ThumbnailCaptureDialog, self).__init__(parent)
         self.setWindowTitle("Capture Thumbnail")
@@ -295,13 +328,10 @@ class ThumbnailCaptureDialog(QtWidgets.QDialog):
         
     def get_selected_size(self):
         """Get selected thumbnail size"""
-        size_map = {
-            0: QtCore.QSize(64, 64),
-            1: QtCore.QSize(128, 128),
-            2: QtCore.QSize(256, 256),
-            3: QtCore.QSize(512, 512)
-        }
-        return size_map.get(self.size_combo.currentIndex(), QtCore.QSize(128, 128))
+        index = self.size_combo.currentIndex()
+        if 0 <= index < len(self._SIZES):
+            return self._SIZES[index]
+        return self._SIZES[1]
         
     def capture_viewport(self):
         """Capture Maya viewport"""
@@ -371,10 +401,14 @@ class ThumbnailCaptureDialog(QtWidgets.QDialog):
 class ThumbnailManager(QtCore.QObject):
     """Manages thumbnails for picker items"""
     
+    # Number of decoded pixmaps kept in the cache
+    MAX_CACHED_PIXMAPS = 64
+    
     def __init__(self, parent=None):
         super(ThumbnailManager, self).__init__(parent)
         self._thumbnails = {}  # item_id -> base64_data
-        self._thumbnail_cache = {}  # base64_data -> QPixmap
+        self._thumbnail_cache = OrderedDict()  # cache_key -> (base64_data, QPixmap), LRU
+        self._cache_index = {}  # base64_data -> [cache_key, ...]
         
     def store_thumbnail(self, item_id, base64_data):
         """Store thumbnail for item"""
@@ -392,8 +426,10 @@ class ThumbnailManager(QtCore.QObject):
             
         # Check cache first
         cache_key = f"{base64_data}_{size}" if size else base64_data
-        if cache_key in self._thumbnail_cache:
-            return self._thumbnail_cache[cache_key]
+        cached = self._thumbnail_cache.get(cache_key)
+        if cached is not None:
+            self._thumbnail_cache.move_to_end(cache_key)
+            return cached[1]
             
         # Create pixmap
         try:
@@ -409,7 +445,7 @@ class ThumbnailManager(QtCore.QObject):
                 )
                 
             # Cache the result
-            self._thumbnail_cache[cache_key] = pixmap
+            self._cache_pixmap(base64_data, cache_key, pixmap)
             return pixmap
             
         except Exception as e:
@@ -417,6 +453,21 @@ class ThumbnailManager(QtCore.QObject):
             
         return QtGui.QPixmap()
         
+    def _cache_pixmap(self, base64_data, cache_key, pixmap):
+        """Cache a decoded pixmap, evicting the least recently used ones"""
+        self._thumbnail_cache[cache_key] = (base64_data, pixmap)
+        cache_keys = self._cache_index.setdefault(base64_data, [])
+        if cache_key not in cache_keys:
+            cache_keys.append(cache_key)
+            
+        while len(self._thumbnail_cache) > self.MAX_CACHED_PIXMAPS:
+            old_key, (old_data, _) = self._thumbnail_cache.popitem(last=False)
+            old_keys = self._cache_index.get(old_data)
+            if old_keys is not None:
+                old_keys.remove(old_key)
+                if not old_keys:
+                    del self._cache_index[old_data]
+        
     def remove_thumbnail(self, item_id):
         """Remove thumbnail for item"""
         if item_id in self._thumbnails:
@@ -424,21 +475,22 @@ class ThumbnailManager(QtCore.QObject):
             del self._thumbnails[item_id]
             
             # Clear from cache
-            cache_keys_to_remove = [key for key in self._thumbnail_cache.keys() if key.startswith(base64_data)]
-            for key in cache_keys_to_remove:
-                del self._thumbnail_cache[key]
+            for key in self._cache_index.pop(base64_data, ()):
+                self._thumbnail_cache.pop(key, None)
                 
     def clear_all_thumbnails(self):
         """Clear all thumbnails"""
         self._thumbnails.clear()
         self._thumbnail_cache.clear()
+        self._cache_index.clear()
         
     def export_thumbnails(self, file_path):
-        """Export thumbnails to file"""
-        import json
+        """Export thumbnails to file as a zip archive of PNGs"""
         try:
-            with open(file_path, 'w') as f:
-                json.dump(self._thumbnails, f)
+            # PNG data is already deflate-compressed, so store it as-is
+            with zipfile.ZipFile(file_path, 'w', zipfile.ZIP_STORED) as archive:
+                for item_id, base64_data in self._thumbnails.items():
+                    archive.writestr(f"{item_id}.png", base64.b64decode(base64_data))
             return True
         except Exception as e:
             print(f"Error exporting thumbnails: {e}")
@@ -446,13 +498,27 @@ class ThumbnailManager(QtCore.QObject):
             
     def import_thumbnails(self, file_path):
         """Import thumbnails from file"""
-        import json
         try:
-            with open(file_path, 'r') as f:
-                imported_thumbnails = json.load(f)
-                self._thumbnails.update(imported_thumbnails)
-                # Clear cache to force regeneration
-                self._thumbnail_cache.clear()
+            if zipfile.is_zipfile(file_path):
+                imported_thumbnails = {}
+                with zipfile.ZipFile(file_path, 'r') as archive:
+                    for name in archive.namelist():
+                        item_id, ext = os.path.splitext(name)
+                        if ext.lower() != '.png':
+                            continue
+                        imported_thumbnails[item_id] = base64.b64encode(
+                            archive.read(name)
+                        ).decode('utf-8')
+            else:
+                # Legacy JSON-of-base64 export
+                import json
+                with open(file_path, 'r') as f:
+                    imported_thumbnails = json.load(f)
+                    
+            self._thumbnails.update(imported_thumbnails)
+            # Clear cache to force regeneration
+            self._thumbnail_cache.clear()
+            self._cache_index.clear()
             return True
         except Exception as e:
             print(f"Error importing thumbnails: {e}")
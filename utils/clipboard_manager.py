@@ -4,11 +4,165 @@ Clipboard Manager for Ultimate Animation Picker
 Handles copy/paste operations for items and styles
 """
 
+import collections
 import json
 import copy
+import functools
+import importlib
+import time
 from PySide2 import QtCore, QtWidgets, QtGui
 from PySide2.QtCore import Signal
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Selection size above which item positions are kept in a NumPy array
+_VECTORIZE_MIN_ITEMS = 50
+
+# JSON helpers, using orjson when it is available
+if orjson is not None:
+    def _dumps(obj, pretty=False):
+        option = orjson.OPT_INDENT_2 if pretty else 0
+        return orjson.dumps(obj, option=option).decode('utf-8')
+    _loads = orjson.loads
+else:
+    def _dumps(obj, pretty=False):
+        if pretty:
+            return json.dumps(obj, indent=2)
+        return json.dumps(obj, separators=(',', ':'))
+    _loads = json.loads
+
+# Item properties carried by copy_style / paste_style
+_STYLE_PROPERTIES = frozenset([
+    'bg_color', 'bg_hover_color', 'bg_click_color',
+    'pen_color', 'pen_hover_color', 'pen_click_color',
+    'pen_width', 'text_color', 'text_hover_color', 'text_click_color',
+    'font_family', 'font_size', 'font_bold', 'font_italic',
+    'opacity', 'border_radius'
+])
+
+# Item class -> {style property: attribute name}, resolved on first paste
+_STYLE_ATTR_MAPS = {}
+
+
+def _get_style_attr_map(item):
+    """Get the attribute each style property is written to for item's class"""
+    item_class = type(item)
+    attr_map = _STYLE_ATTR_MAPS.get(item_class)
+    if attr_map is None:
+        attr_map = {}
+        for prop in _STYLE_PROPERTIES:
+            if hasattr(item, prop):
+                attr_map[prop] = prop
+            elif hasattr(item, f'_{prop}'):
+                attr_map[prop] = f'_{prop}'
+        _STYLE_ATTR_MAPS[item_class] = attr_map
+    return attr_map
+
+
+# Item type name -> items module that defines it
+_ITEM_CLASS_MODULES = {
+    'RectangleItem': 'rectangle',
+    'ButtonItem': 'button',
+    'PolygonItem': 'polygon',
+    'SliderItem': 'slider',
+    'CheckboxItem': 'checkbox',
+    'RadiusButtonItem': 'radius_button',
+    'PoseButtonItem': 'pose_button',
+    'TextItem': 'text_item'
+}
+
+# Item type name -> class, built on first paste
+_ITEM_CLASS_CACHE = None
+
+
+def _get_item_classes():
+    """Get item type lookup table, importing item modules once"""
+    global _ITEM_CLASS_CACHE
+    if _ITEM_CLASS_CACHE is None:
+        classes = {}
+        complete = True
+        for class_name, module_name in _ITEM_CLASS_MODULES.items():
+            # Import item classes with fallback for different import contexts
+            try:
+                module = importlib.import_module(f"..items.{module_name}", __package__)
+            except (ImportError, TypeError, ValueError):
+                try:
+                    module = importlib.import_module(f"items.{module_name}")
+                except ImportError as e:
+                    print(f"Error importing {class_name}: {e}")
+                    complete = False
+                    continue
+            classes[class_name] = getattr(module, class_name)
+            
+        # Retry failed imports on the next call instead of caching the gap
+        if not complete:
+            return classes
+        _ITEM_CLASS_CACHE = classes
+    return _ITEM_CLASS_CACHE
+
+
+# Keys held in the positions column rather than in per-item extras
+_POSITION_KEYS = frozenset(['position', 'relative_position'])
+
+
+def _pack_items(items_data):
+    """Split serialized items into parallel columns
+    
+    Returns a dict with 'positions' (an (N, 2) array when NumPy is available
+    and the selection is large, otherwise a list of tuples), 'types' and
+    'extras' (each item's remaining fields).
+    """
+    positions = [
+        tuple(item_data.get('position', item_data.get('relative_position', (0, 0))))
+        for item_data in items_data
+    ]
+    if len(positions) > _VECTORIZE_MIN_ITEMS and np is not None:
+        positions = np.array(positions, dtype=np.float64).reshape(-1, 2)
+        
+    return {
+        'positions': positions,
+        'types': [item_data.get('type', 'unknown') for item_data in items_data],
+        'extras': [
+            {key: value for key, value in item_data.items() if key not in _POSITION_KEYS}
+            for item_data in items_data
+        ]
+    }
+
+
+def _relative_positions(positions):
+    """Get positions relative to the first one as a list of (x, y) pairs"""
+    if np is not None and isinstance(positions, np.ndarray):
+        return (positions - positions[0]).tolist()
+    if not positions:
+        return []
+    first_x, first_y = positions[0]
+    return [(x - first_x, y - first_y) for x, y in positions]
+
+
+def _unpack_items(columns):
+    """Rebuild the list-of-dicts item layout from packed columns"""
+    positions = columns['positions']
+    if np is not None and isinstance(positions, np.ndarray):
+        positions = positions.tolist()
+        
+    items_data = []
+    for extra, position, relative_pos in zip(
+            columns['extras'], positions, _relative_positions(columns['positions'])):
+        item_data = dict(extra)
+        item_data['position'] = tuple(position)
+        item_data['relative_position'] = tuple(relative_pos)
+        items_data.append(item_data)
+    return items_data
+
+
 class ClipboardData:
     """Container for clipboard data"""
     
@@ -21,7 +175,36 @@ class ClipboardData:
         self.data_type = data_type
         self.data = data
         self.metadata = metadata or {}
-        self.timestamp = QtCore.QDateTime.currentDateTime()
+        self.timestamp = time.monotonic()
+        
+    def __deepcopy__(self, memo):
+        """Copy through a JSON round-trip instead of a generic deepcopy
+        
+        Clipboard data is expected to stay JSON-compatible (tuples come back
+        as lists); anything else falls back to copy.deepcopy.
+        """
+        try:
+            if self.data_type == ClipboardData.TYPE_ITEMS:
+                data = _pack_items(_loads(self.to_json()))
+            else:
+                data = _loads(_dumps(self.data))
+        except (TypeError, ValueError):
+            data = copy.deepcopy(self.data, memo)
+            
+        clone = ClipboardData(self.data_type, data, dict(self.metadata))
+        clone.timestamp = self.timestamp
+        memo[id(self)] = clone
+        return clone
+        
+    def get_items_data(self):
+        """Get items data in the serialized list-of-dicts layout"""
+        if self.data_type == ClipboardData.TYPE_ITEMS:
+            return _unpack_items(self.data)
+        return self.data
+        
+    def to_json(self, pretty=False):
+        """Encode clipboard data as JSON"""
+        return _dumps(self.get_items_data(), pretty)
         
     def is_valid(self):
         """Check if clipboard data is valid"""
@@ -29,7 +212,7 @@ class ClipboardData:
         
     def get_age_seconds(self):
         """Get age of clipboard data in seconds"""
-        return self.timestamp.secsTo(QtCore.QDateTime.currentDateTime())
+        return int(time.monotonic() - self.timestamp)
 
 
 class ClipboardManager(QtCore.QObject):
@@ -43,52 +226,68 @@ class ClipboardManager(QtCore.QObject):
     def __init__(self, parent=None):
         super(ClipboardManager, self).__init__(parent)
         self._clipboard_data = None
-        self._system_clipboard = QtWidgets.QApplication.clipboard()
+        self._system_clipboard_ref = None  # Fetched on first use
         self._max_age_hours = 24  # Maximum age for clipboard data
+        self._expires_at = 0.0  # Monotonic time after which data is stale
+        self._last_has_data = False  # Last state sent through clipboard_changed
+        self._last_system_json_text = None  # Last JSON written to system clipboard
+        self._last_system_json_data = None  # Data that JSON was encoded from
+        
+    @property
+    def _system_clipboard(self):
+        """System clipboard, looked up once a QApplication is needed"""
+        if self._system_clipboard_ref is None:
+            self._system_clipboard_ref = QtWidgets.QApplication.clipboard()
+        return self._system_clipboard_ref
+        
+    def _set_clipboard_data(self, clipboard_data):
+        """Replace clipboard data and recompute its expiry deadline"""
+        self._clipboard_data = clipboard_data
+        if clipboard_data is not None and clipboard_data.is_valid():
+            self._expires_at = clipboard_data.timestamp + self._max_age_hours * 3600
+        else:
+            self._expires_at = 0.0
+        
+    def _set_has_data(self, has_data):
+        """Emit clipboard_changed only when the has-data state flips"""
+        if has_data != self._last_has_data:
+            self._last_has_data = has_data
+            self.clipboard_changed.emit(has_data)
+            
+    def copy_items(self, items, pretty=False):
+        """Copy items to clipboard
         
-    def copy_items(self, items):
-        """Copy items to clipboard"""
+        The system clipboard receives compact JSON unless ``pretty`` is set.
+        """
         if not items:
             return False
             
         try:
             # Serialize items
-            items_data = []
-            for item in items:
-                if hasattr(item, 'to_dict'):
-                    item_data = item.to_dict()
-                    # Store position relative to first item
-                    if items_data:
-                        first_pos = items_data[0].get('position', (0, 0))
-                        current_pos = item_data.get('position', (0, 0))
-                        relative_pos = (
-                            current_pos[0] - first_pos[0],
-                            current_pos[1] - first_pos[1]
-                        )
-                        item_data['relative_position'] = relative_pos
-                    else:
-                        item_data['relative_position'] = (0, 0)
-                        
-                    items_data.append(item_data)
-                    
+            items_data = [item.to_dict() for item in items if hasattr(item, 'to_dict')]
+            
             if items_data:
+                columns = _pack_items(items_data)
                 metadata = {
                     'count': len(items_data),
-                    'types': [item.get('type', 'unknown') for item in items_data]
+                    'types': list(columns['types'])
                 }
                 
-                self._clipboard_data = ClipboardData(
+                clipboard_data = ClipboardData(
                     ClipboardData.TYPE_ITEMS,
-                    items_data,
+                    columns,
                     metadata
                 )
+                self._set_clipboard_data(clipboard_data)
                 
                 # Also copy to system clipboard as JSON
-                json_data = json.dumps(items_data, indent=2)
+                json_data = clipboard_data.to_json(pretty)
                 self._system_clipboard.setText(json_data)
+                self._last_system_json_text = json_data
+                self._last_system_json_data = columns
                 
                 self.data_copied.emit(ClipboardData.TYPE_ITEMS)
-                self.clipboard_changed.emit(True)
+                self._set_has_data(True)
                 return True
                 
         except Exception as e:
@@ -102,26 +301,27 @@ class ClipboardManager(QtCore.QObject):
             return []
             
         try:
-            items_data = self._clipboard_data.data
+            columns = self._clipboard_data.data
             pasted_items = []
             
             # Calculate paste position
             if target_position is None:
-                target_position = QtCore.QPointF(0, 0)
+                target_x, target_y = 0.0, 0.0
+            else:
+                target_x, target_y = target_position.x(), target_position.y()
                 
-            # Create items from data
-            for item_data in items_data:
-                # Calculate final position
-                relative_pos = item_data.get('relative_position', (0, 0))
-                final_position = QtCore.QPointF(
-                    target_position.x() + relative_pos[0],
-                    target_position.y() + relative_pos[1]
+            # Create items from data, walking the columns in lock-step
+            for extra, relative_pos in zip(
+                    columns['extras'], _relative_positions(columns['positions'])):
+                # Copy the extras (from_dict only reads the values, so a
+                # shallow copy keeps the clipboard data untouched) and add
+                # the final position
+                item_data_copy = dict(extra)
+                item_data_copy['position'] = (
+                    target_x + relative_pos[0],
+                    target_y + relative_pos[1]
                 )
                 
-                # Update position in data
-                item_data_copy = copy.deepcopy(item_data)
-                item_data_copy['position'] = (final_position.x(), final_position.y())
-                
                 # Create item based on type
                 item = self._create_item_from_data(item_data_copy, parent_widget)
                 if item:
@@ -146,18 +346,7 @@ class ClipboardManager(QtCore.QObject):
             item_data = item.to_dict()
             
             # Extract style-related properties
-            style_data = {}
-            style_properties = [
-                'bg_color', 'bg_hover_color', 'bg_click_color',
-                'pen_color', 'pen_hover_color', 'pen_click_color',
-                'pen_width', 'text_color', 'text_hover_color', 'text_click_color',
-                'font_family', 'font_size', 'font_bold', 'font_italic',
-                'opacity', 'border_radius'
-            ]
-            
-            for prop in style_properties:
-                if prop in item_data:
-                    style_data[prop] = item_data[prop]
+            style_data = {prop: item_data[prop] for prop in _STYLE_PROPERTIES.intersection(item_data)}
                     
             if style_data:
                 metadata = {
@@ -165,14 +354,14 @@ class ClipboardManager(QtCore.QObject):
                     'property_count': len(style_data)
                 }
                 
-                self._clipboard_data = ClipboardData(
+                self._set_clipboard_data(ClipboardData(
                     ClipboardData.TYPE_STYLE,
                     style_data,
                     metadata
-                )
+                ))
                 
                 self.data_copied.emit(ClipboardData.TYPE_STYLE)
-                self.clipboard_changed.emit(True)
+                self._set_has_data(True)
                 return True
                 
         except Exception as e:
@@ -192,11 +381,11 @@ class ClipboardManager(QtCore.QObject):
             for item in items:
                 if hasattr(item, 'from_dict'):
                     # Apply style properties to item
+                    attr_map = _get_style_attr_map(item)
                     for prop, value in style_data.items():
-                        if hasattr(item, prop):
-                            setattr(item, prop, value)
-                        elif hasattr(item, f'_{prop}'):
-                            setattr(item, f'_{prop}', value)
+                        attr_name = attr_map.get(prop)
+                        if attr_name is not None:
+                            setattr(item, attr_name, value)
                             
                     # Update item display
                     if hasattr(item, 'update'):
@@ -221,14 +410,14 @@ class ClipboardManager(QtCore.QObject):
                 'object_count': len(pose_data) if isinstance(pose_data, dict) else 0
             }
             
-            self._clipboard_data = ClipboardData(
+            self._set_clipboard_data(ClipboardData(
                 ClipboardData.TYPE_POSE,
                 pose_data,
                 metadata
-            )
+            ))
             
             self.data_copied.emit(ClipboardData.TYPE_POSE)
-            self.clipboard_changed.emit(True)
+            self._set_has_data(True)
             return True
             
         except Exception as e:
@@ -251,14 +440,14 @@ class ClipboardManager(QtCore.QObject):
                 'object_count': len(animation_data) if isinstance(animation_data, dict) else 0
             }
             
-            self._clipboard_data = ClipboardData(
+            self._set_clipboard_data(ClipboardData(
                 ClipboardData.TYPE_ANIMATION,
                 animation_data,
                 metadata
-            )
+            ))
             
             self.data_copied.emit(ClipboardData.TYPE_ANIMATION)
-            self.clipboard_changed.emit(True)
+            self._set_has_data(True)
             return True
             
         except Exception as e:
@@ -274,9 +463,14 @@ class ClipboardManager(QtCore.QObject):
         
     def has_data(self):
         """Check if clipboard has any data"""
-        return (self._clipboard_data and 
-                self._clipboard_data.is_valid() and
-                self._clipboard_data.get_age_seconds() < self._max_age_hours * 3600)
+        if self._clipboard_data is None:
+            return False
+        if time.monotonic() < self._expires_at:
+            return True
+            
+        # Data went stale since the last check
+        self._set_has_data(False)
+        return False
                 
     def has_items(self):
         """Check if clipboard has items"""
@@ -314,7 +508,7 @@ class ClipboardManager(QtCore.QObject):
             types = metadata.get('types', [])
             info_parts.append(f"Items: {count}")
             if types:
-                unique_types = list(set(types))
+                unique_types = list(dict.fromkeys(types))
                 info_parts.append(f"Types: {', '.join(unique_types)}")
                 
         elif data_type == ClipboardData.TYPE_STYLE:
@@ -343,33 +537,41 @@ class ClipboardManager(QtCore.QObject):
         
     def clear_clipboard(self):
         """Clear clipboard data"""
-        self._clipboard_data = None
-        self.clipboard_changed.emit(False)
+        self._set_clipboard_data(None)
+        self._set_has_data(False)
         
     def import_from_system_clipboard(self):
         """Import data from system clipboard"""
         try:
             text_data = self._system_clipboard.text()
             if text_data:
-                # Try to parse as JSON
-                import_data = json.loads(text_data)
-                
-                # Determine data type
-                if isinstance(import_data, list) and import_data:
-                    # Assume it's items data
-                    metadata = {
-                        'count': len(import_data),
-                        'imported': True
-                    }
+                if text_data == self._last_system_json_text:
+                    # Our own copy, no need to parse it again
+                    columns = self._last_system_json_data
+                else:
+                    # Try to parse as JSON
+                    import_data = _loads(text_data)
                     
-                    self._clipboard_data = ClipboardData(
-                        ClipboardData.TYPE_ITEMS,
-                        import_data,
-                        metadata
-                    )
+                    # Determine data type
+                    if not isinstance(import_data, list) or not import_data:
+                        return False
+                        
+                    # Assume it's items data
+                    columns = _pack_items(import_data)
                     
-                    self.clipboard_changed.emit(True)
-                    return True
+                metadata = {
+                    'count': len(columns['extras']),
+                    'imported': True
+                }
+                
+                self._set_clipboard_data(ClipboardData(
+                    ClipboardData.TYPE_ITEMS,
+                    columns,
+                    metadata
+                ))
+                
+                self._set_has_data(True)
+                return True
                     
         except (json.JSONDecodeError, Exception) as e:
             print(f"Error importing from system clipboard: {e}")
@@ -380,60 +582,14 @@ class ClipboardManager(QtCore.QObject):
         """Create item instance from serialized data"""
         item_type = item_data.get('type', 'unknown')
         
-        # Import item classes with fallback for different import contexts
         try:
-            if item_type == 'RectangleItem':
-                try:
-                    from ..items.rectangle import RectangleItem
-                except ImportError:
-                    from items.rectangle import RectangleItem
-                item = RectangleItem()
-            elif item_type == 'ButtonItem':
-                try:
-                    from ..items.button import ButtonItem
-                except ImportError:
-                    from items.button import ButtonItem
-                item = ButtonItem()
-            elif item_type == 'PolygonItem':
-                try:
-                    from ..items.polygon import PolygonItem
-                except ImportError:
-                    from items.polygon import PolygonItem
-                item = PolygonItem()
-            elif item_type == 'SliderItem':
-                try:
-                    from ..items.slider import SliderItem
-                except ImportError:
-                    from items.slider import SliderItem
-                item = SliderItem()
-            elif item_type == 'CheckboxItem':
-                try:
-                    from ..items.checkbox import CheckboxItem
-                except ImportError:
-                    from items.checkbox import CheckboxItem
-                item = CheckboxItem()
-            elif item_type == 'RadiusButtonItem':
-                try:
-                    from ..items.radius_button import RadiusButtonItem
-                except ImportError:
-                    from items.radius_button import RadiusButtonItem
-                item = RadiusButtonItem()
-            elif item_type == 'PoseButtonItem':
-                try:
-                    from ..items.pose_button import PoseButtonItem
-                except ImportError:
-                    from items.pose_button import PoseButtonItem
-                item = PoseButtonItem()
-            elif item_type == 'TextItem':
-                try:
-                    from ..items.text_item import TextItem
-                except ImportError:
-                    from items.text_item import TextItem
-                item = TextItem()
-            else:
+            item_class = _get_item_classes().get(item_type)
+            if item_class is None:
                 print(f"Unknown item type: {item_type}")
                 return None
                 
+            item = item_class()
+                
             # Restore item data
             if hasattr(item, 'from_dict'):
                 item.from_dict(item_data)
@@ -451,24 +607,18 @@ class ClipboardHistory(QtCore.QObject):
     
     def __init__(self, max_history=10, parent=None):
         super(ClipboardHistory, self).__init__(parent)
-        self._history = []
+        self._history = collections.deque(maxlen=max_history)
         self._max_history = max_history
         self._current_index = -1
         
     def add_to_history(self, clipboard_data):
         """Add clipboard data to history"""
         # Remove any items after current index (when navigating back)
-        if self._current_index < len(self._history) - 1:
-            self._history = self._history[:self._current_index + 1]
+        while len(self._history) > self._current_index + 1:
+            self._history.pop()
             
-        # Add new item
+        # Add new item (the deque drops the oldest entry when full)
         self._history.append(clipboard_data)
-        
-        # Trim history if too long
-        if len(self._history) > self._max_history:
-            self._history.pop(0)
-        else:
-            self._current_index += 1
             
         # Set current index to latest
         self._current_index = len(self._history) - 1
@@ -493,9 +643,8 @@ class ClipboardHistory(QtCore.QObject):
             return self._history[self._current_index]
         return None
         
-    def get_history_list(self):
-        """Get list of history items with descriptions"""
-        history_list = []
+    def iter_history_descriptions(self):
+        """Yield history items with descriptions, formatting each on demand"""
         for i, data in enumerate(self._history):
             description = f"{data.data_type}"
             if data.metadata:
@@ -507,14 +656,16 @@ class ClipboardHistory(QtCore.QObject):
             age_minutes = data.get_age_seconds() // 60
             description += f" - {age_minutes}m ago"
             
-            history_list.append({
+            yield {
                 'index': i,
                 'description': description,
                 'is_current': i == self._current_index,
                 'data': data
-            })
+            }
             
-        return history_list
+    def get_history_list(self):
+        """Get list of history items with descriptions"""
+        return list(self.iter_history_descriptions())
         
     def clear_history(self):
         """Clear clipboard history"""
@@ -523,11 +674,7 @@ class ClipboardHistory(QtCore.QObject):
 
 
 # Global clipboard manager instance
-_clipboard_manager = None
-
+@functools.lru_cache(maxsize=1)
 def get_clipboard_manager():
     """Get global clipboard manager instance"""
-    global _clipboard_manager
-    if _clipboard_manager is None:
-        _clipboard_manager = ClipboardManager()
-    return _clipboard_manager
+    return ClipboardManager()
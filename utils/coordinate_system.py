@@ -4,9 +4,96 @@ Coordinate System Utilities for Ultimate Animation Picker
 Handles Local/World coordinate transformations and positioning
 """
 
-from PySide2 import QtCore, QtGui
+from PySide2 import QtCore, QtGui, QtWidgets
 import math
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+def _jit(func):
+    """Compile an arithmetic kernel with Numba when it is available"""
+    if numba is None:
+        return func
+    return numba.njit(cache=True, fastmath=True)(func)
+
+
+@_jit
+def _grid_endpoints(m11, m12, m21, m22, dx, dy, xs, top, bottom):
+    """Map the lines x = xs from top to bottom through an affine matrix
+    
+    Returns an (N, 4) array of (x0, y0, x1, y1) rows.
+    """
+    out = np.empty((xs.shape[0], 4))
+    out[:, 0] = m11 * xs + (m21 * top + dx)
+    out[:, 1] = m12 * xs + (m22 * top + dy)
+    out[:, 2] = m11 * xs + (m21 * bottom + dx)
+    out[:, 3] = m12 * xs + (m22 * bottom + dy)
+    return out
+
+
+def _is_positionable(item):
+    """Check if item can be read and moved with pos()/setPos()"""
+    # isinstance is cheap for the common case; hasattr covers duck-typed items
+    if isinstance(item, QtWidgets.QGraphicsItem):
+        return True
+    return hasattr(item, 'pos') and hasattr(item, 'setPos')
+
+
+def _set_point(out, x, y):
+    """Write (x, y) into an existing QPointF, or create one if out is None"""
+    if out is None:
+        return QtCore.QPointF(x, y)
+    out.setX(x)
+    out.setY(y)
+    return out
+
+
+# Shared result of get_grid_lines when there is nothing to draw
+_EMPTY_LINES = ((), ())
+
+# Maximum number of grid lines get_grid_lines will generate per call
+MAX_GRID_LINES = 5000
+
+# Position changes smaller than this are treated as no movement
+_POSITION_EPSILON = 1e-6
+
+
+def _united_bounds(bounds):
+    """Get the QRectF enclosing a list of (x0, y0, x1, y1) bounds"""
+    if not bounds:
+        return QtCore.QRectF()
+        
+    if np is not None:
+        arr = np.array(bounds, dtype=np.float64)
+        arr = arr[np.isfinite(arr).all(axis=1)]
+        if not len(arr):
+            return QtCore.QRectF()
+        min_x, min_y = arr[:, :2].min(axis=0).tolist()
+        max_x, max_y = arr[:, 2:].max(axis=0).tolist()
+        return QtCore.QRectF(min_x, min_y, max_x - min_x, max_y - min_y)
+        
+    min_x = min_y = float('inf')
+    max_x = max_y = float('-inf')
+    for x0, y0, x1, y1 in bounds:
+        if x0 < min_x:
+            min_x = x0
+        if y0 < min_y:
+            min_y = y0
+        if x1 > max_x:
+            max_x = x1
+        if y1 > max_y:
+            max_y = y1
+    return QtCore.QRectF(min_x, min_y, max_x - min_x, max_y - min_y)
+
+
 class CoordinateSystem:
     """Coordinate system types"""
     LOCAL = "Local"
@@ -19,20 +106,46 @@ class CoordinateTransform(QtCore.QObject):
     def __init__(self, parent=None):
         super(CoordinateTransform, self).__init__(parent)
         self._canvas_transform = QtGui.QTransform()
+        self._inverse_transform = QtGui.QTransform()
+        self._invertible = True
         self._zoom_factor = 1.0
         self._pan_offset = QtCore.QPointF(0, 0)
         
-    def set_canvas_transform(self, transform):
-        """Set canvas transformation matrix"""
-        self._canvas_transform = transform
+        # Plain float copies of zoom/pan for the screen mapping methods
+        self._zoom = 1.0
+        self._inv_zoom = 1.0
+        self._pan_x = 0.0
+        self._pan_y = 0.0
+        self._is_identity = True  # No zoom and no pan
         
-    def set_zoom_factor(self, zoom):
-        """Set zoom factor"""
-        self._zoom_factor = zoom
+    def set_state(self, zoom, pan_offset):
+        """Set zoom and pan, updating every derived value in one pass"""
+        zoom = float(zoom)
+        pan_x, pan_y = pan_offset.x(), pan_offset.y()
         
-    def set_pan_offset(self, offset):
-        """Set pan offset"""
-        self._pan_offset = offset
+        self._zoom_factor = zoom
+        self._pan_offset = pan_offset
+        self._zoom = zoom
+        self._pan_x = pan_x
+        self._pan_y = pan_y
+        self._is_identity = zoom == 1.0 and pan_x == 0.0 and pan_y == 0.0
+        
+        # Translate-then-scale matrix and its inverse, built directly
+        self._canvas_transform = QtGui.QTransform(zoom, 0.0, 0.0, zoom, pan_x, pan_y)
+        self._invertible = zoom != 0.0
+        if self._invertible:
+            inv_zoom = 1.0 / zoom
+            self._inv_zoom = inv_zoom
+            self._inverse_transform = QtGui.QTransform(
+                inv_zoom, 0.0, 0.0, inv_zoom, -pan_x * inv_zoom, -pan_y * inv_zoom
+            )
+        else:
+            self._inv_zoom = 0.0
+            self._inverse_transform = QtGui.QTransform()
+            
+    def get_canvas_transform(self):
+        """Get canvas transformation matrix"""
+        return self._canvas_transform
         
     def local_to_world(self, local_point):
         """Transform local coordinates to world coordinates"""
@@ -40,43 +153,89 @@ class CoordinateTransform(QtCore.QObject):
         
     def world_to_local(self, world_point):
         """Transform world coordinates to local coordinates"""
-        inverse_transform, invertible = self._canvas_transform.inverted()
-        if invertible:
-            return inverse_transform.map(world_point)
+        if self._invertible:
+            return self._inverse_transform.map(world_point)
         return world_point
         
-    def local_to_screen(self, local_point):
-        """Transform local coordinates to screen coordinates"""
+    def local_to_screen(self, local_point, out=None):
+        """Transform local coordinates to screen coordinates
+        
+        If ``out`` is given it is filled in and returned instead of
+        allocating a new QPointF.
+        """
+        if self._is_identity and out is None:
+            return local_point
+            
         # Apply zoom and pan
-        screen_point = QtCore.QPointF(
-            local_point.x() * self._zoom_factor + self._pan_offset.x(),
-            local_point.y() * self._zoom_factor + self._pan_offset.y()
-        )
-        return screen_point
+        x, y = self.local_to_screen_xy(local_point.x(), local_point.y())
+        return _set_point(out, x, y)
         
-    def screen_to_local(self, screen_point):
-        """Transform screen coordinates to local coordinates"""
-        # Remove pan and zoom
-        local_point = QtCore.QPointF(
-            (screen_point.x() - self._pan_offset.x()) / self._zoom_factor,
-            (screen_point.y() - self._pan_offset.y()) / self._zoom_factor
-        )
-        return local_point
+    def local_to_screen_xy(self, x, y):
+        """Transform local (x, y) scalars to screen (x, y) scalars"""
+        return x * self._zoom + self._pan_x, y * self._zoom + self._pan_y
+        
+    def screen_to_local(self, screen_point, out=None):
+        """Transform screen coordinates to local coordinates
         
-    def apply_zoom_to_point(self, point, zoom_center, old_zoom, new_zoom):
+        If ``out`` is given it is filled in and returned instead of
+        allocating a new QPointF.
+        """
+        if self._is_identity and out is None:
+            return screen_point
+            
+        # Remove pan and zoom
+        x, y = self.screen_to_local_xy(screen_point.x(), screen_point.y())
+        return _set_point(out, x, y)
+        
+    def screen_to_local_xy(self, x, y):
+        """Transform screen (x, y) scalars to local (x, y) scalars"""
+        return (x - self._pan_x) * self._inv_zoom, (y - self._pan_y) * self._inv_zoom
+        
+    def local_to_screen_batch(self, points):
+        """Transform an (N, 2) array of local points to screen coordinates
+        
+        Requires NumPy.
+        """
+        points = np.asarray(points, dtype=np.float64)
+        if self._is_identity:
+            return points
+        return points * self._zoom + (self._pan_x, self._pan_y)
+        
+    def screen_to_local_batch(self, points):
+        """Transform an (N, 2) array of screen points to local coordinates
+        
+        Requires NumPy.
+        """
+        points = np.asarray(points, dtype=np.float64)
+        if self._is_identity:
+            return points
+        return (points - (self._pan_x, self._pan_y)) * self._inv_zoom
+        
+    def local_to_world_batch(self, points):
+        """Transform an (N, 2) array of local points to world coordinates
+        
+        Requires NumPy. Only the affine part of the canvas transform is
+        applied.
+        """
+        points = np.asarray(points, dtype=np.float64)
+        transform = self._canvas_transform
+        matrix = np.array([
+            [transform.m11(), transform.m12()],
+            [transform.m21(), transform.m22()]
+        ])
+        return points @ matrix + (transform.dx(), transform.dy())
+        
+    def apply_zoom_to_point(self, point, zoom_center, old_zoom, new_zoom, out=None):
         """Apply zoom transformation around a center point"""
         if old_zoom == 0:
             return point
             
-        # Vector from zoom center to point
-        offset = point - zoom_center
-        
-        # Scale the offset
+        # Scale the offset from the zoom center
         scale_factor = new_zoom / old_zoom
-        scaled_offset = offset * scale_factor
-        
-        # Return new position
-        return zoom_center + scaled_offset
+        cx = zoom_center.x()
+        cy = zoom_center.y()
+        return _set_point(out, cx + (point.x() - cx) * scale_factor,
+                          cy + (point.y() - cy) * scale_factor)
 
 
 class PositionManager(QtCore.QObject):
@@ -88,14 +247,17 @@ class PositionManager(QtCore.QObject):
         
     def set_item_position(self, item, position, coordinate_system=CoordinateSystem.LOCAL):
         """Set item position in specified coordinate system"""
-        if not hasattr(item, 'setPos'):
+        if not isinstance(item, QtWidgets.QGraphicsItem) and not hasattr(item, 'setPos'):
             return False
             
         if coordinate_system == CoordinateSystem.WORLD:
             # Convert world position to local
-            local_position = self._coordinate_transform.world_to_local(position)
-            item.setPos(local_position)
-        else:
+            position = self._coordinate_transform.world_to_local(position)
+            
+        # Skip setPos (and the scene update it triggers) if nothing moves
+        current_pos = item.pos()
+        if (abs(current_pos.x() - position.x()) >= _POSITION_EPSILON or
+                abs(current_pos.y() - position.y()) >= _POSITION_EPSILON):
             item.setPos(position)
             
         # Store coordinate system preference
@@ -106,7 +268,7 @@ class PositionManager(QtCore.QObject):
         
     def get_item_position(self, item, coordinate_system=CoordinateSystem.LOCAL):
         """Get item position in specified coordinate system"""
-        if not hasattr(item, 'pos'):
+        if not isinstance(item, QtWidgets.QGraphicsItem) and not hasattr(item, 'pos'):
             return QtCore.QPointF()
             
         local_position = item.pos()
@@ -128,15 +290,46 @@ class PositionManager(QtCore.QObject):
         
     def align_items_to_grid(self, items, grid_size=10, coordinate_system=CoordinateSystem.LOCAL):
         """Snap items to grid"""
-        for item in items:
-            current_pos = self.get_item_position(item, coordinate_system)
+        items = [item for item in items if _is_positionable(item)]
+        if not items:
+            return
+            
+        inv_grid_size = 1.0 / grid_size
+        
+        QPointF = QtCore.QPointF
+        get_item_position = self.get_item_position
+        set_item_position = self.set_item_position
+        
+        if np is None:
+            for item in items:
+                current_pos = get_item_position(item, coordinate_system)
+                
+                # Snap to grid
+                snapped_x = round(current_pos.x() * inv_grid_size) * grid_size
+                snapped_y = round(current_pos.y() * inv_grid_size) * grid_size
+                
+                set_item_position(item, QPointF(snapped_x, snapped_y), coordinate_system)
+            return
             
-            # Snap to grid
-            snapped_x = round(current_pos.x() / grid_size) * grid_size
-            snapped_y = round(current_pos.y() / grid_size) * grid_size
-            snapped_pos = QtCore.QPointF(snapped_x, snapped_y)
+        # Gather all positions and snap them in one pass
+        positions = np.fromiter(
+            (value for item in items for value in (item.pos().x(), item.pos().y())),
+            dtype=np.float64,
+            count=len(items) * 2
+        ).reshape(-1, 2)
+        
+        if coordinate_system == CoordinateSystem.WORLD:
+            positions = self._coordinate_transform.local_to_world_batch(positions)
             
-            self.set_item_position(item, snapped_pos, coordinate_system)
+        snapped = np.round(positions * inv_grid_size) * grid_size
+        
+        moved = (np.abs(snapped - positions) >= _POSITION_EPSILON).any(axis=1).tolist()
+        
+        for item, (snapped_x, snapped_y), item_moved in zip(items, snapped.tolist(), moved):
+            if item_moved:
+                set_item_position(item, QPointF(snapped_x, snapped_y), coordinate_system)
+            elif hasattr(item, 'coordinate_system'):
+                item.coordinate_system = coordinate_system
 
 
 class ZoomManager(QtCore.QObject):
@@ -196,23 +389,17 @@ class ZoomManager(QtCore.QObject):
             return self._zoom_factor
             
         # Calculate bounding rectangle of all items
-        bounding_rect = QtCore.QRectF()
+        bounds = []
         for item in items:
-            if hasattr(item, 'boundingRect') and hasattr(item, 'pos'):
+            if isinstance(item, QtWidgets.QGraphicsItem) or (
+                    hasattr(item, 'boundingRect') and hasattr(item, 'pos')):
                 item_rect = item.boundingRect()
                 item_pos = item.pos()
-                world_rect = QtCore.QRectF(
-                    item_pos.x() + item_rect.x(),
-                    item_pos.y() + item_rect.y(),
-                    item_rect.width(),
-                    item_rect.height()
-                )
+                x0 = item_pos.x() + item_rect.x()
+                y0 = item_pos.y() + item_rect.y()
+                bounds.append((x0, y0, x0 + item_rect.width(), y0 + item_rect.height()))
                 
-                if bounding_rect.isEmpty():
-                    bounding_rect = world_rect
-                else:
-                    bounding_rect = bounding_rect.united(world_rect)
-                    
+        bounding_rect = _united_bounds(bounds)
         return self.zoom_to_fit(bounding_rect, viewport_rect)
         
     def set_zoom_limits(self, min_zoom, max_zoom):
@@ -236,6 +423,13 @@ class PanManager(QtCore.QObject):
         self._is_panning = False
         self._last_pan_point = QtCore.QPointF()
         
+        # Coalesces bursts of update_pan calls into one pan_changed per
+        # event loop pass
+        self._emit_timer = QtCore.QTimer(self)
+        self._emit_timer.setSingleShot(True)
+        self._emit_timer.setInterval(0)
+        self._emit_timer.timeout.connect(self._emit_pan_changed)
+        
     def start_pan(self, start_point):
         """Start panning operation"""
         self._is_panning = True
@@ -250,17 +444,34 @@ class PanManager(QtCore.QObject):
         self._pan_offset += delta
         self._last_pan_point = current_point
         
-        self.pan_changed.emit(self._pan_offset)
-        
+        if not self._emit_timer.isActive():
+            self._emit_timer.start()
+            
     def end_pan(self):
         """End panning operation"""
         self._is_panning = False
         
+        # Deliver any pan still waiting on the timer
+        if self._emit_timer.isActive():
+            self._emit_timer.stop()
+            self._emit_pan_changed()
+            
+    def _emit_pan_changed(self):
+        """Emit pan_changed with the current offset"""
+        self.pan_changed.emit(self._pan_offset)
+        
     def set_pan_offset(self, offset):
         """Set pan offset directly"""
+        self._emit_timer.stop()
         self._pan_offset = offset
         self.pan_changed.emit(self._pan_offset)
         
+    def set_pan_offset_xy(self, x, y):
+        """Set pan offset from coordinates, updating the offset in place"""
+        self._emit_timer.stop()
+        _set_point(self._pan_offset, x, y)
+        self.pan_changed.emit(self._pan_offset)
+        
     def get_pan_offset(self):
         """Get current pan offset"""
         return self._pan_offset
@@ -297,64 +508,49 @@ class ViewportManager(QtCore.QObject):
         zoom = self.zoom_manager.get_zoom_factor()
         pan = self.pan_manager.get_pan_offset()
         
-        self.coordinate_transform.set_zoom_factor(zoom)
-        self.coordinate_transform.set_pan_offset(pan)
-        
-        # Create combined transform
-        transform = QtGui.QTransform()
-        transform.translate(pan.x(), pan.y())
-        transform.scale(zoom, zoom)
-        
-        self.coordinate_transform.set_canvas_transform(transform)
+        self.coordinate_transform.set_state(zoom, pan)
         self.viewport_changed.emit()
         
     def get_viewport_transform(self):
         """Get combined viewport transformation matrix"""
-        zoom = self.zoom_manager.get_zoom_factor()
-        pan = self.pan_manager.get_pan_offset()
-        
-        transform = QtGui.QTransform()
-        transform.translate(pan.x(), pan.y())
-        transform.scale(zoom, zoom)
-        
-        return transform
+        return self.coordinate_transform.get_canvas_transform()
         
     def map_to_viewport(self, scene_point):
         """Map scene coordinates to viewport coordinates"""
-        transform = self.get_viewport_transform()
-        return transform.map(scene_point)
+        return self.coordinate_transform.local_to_world(scene_point)
         
     def map_from_viewport(self, viewport_point):
         """Map viewport coordinates to scene coordinates"""
-        transform = self.get_viewport_transform()
-        inverse_transform, invertible = transform.inverted()
-        if invertible:
-            return inverse_transform.map(viewport_point)
-        return viewport_point
+        return self.coordinate_transform.world_to_local(viewport_point)
+        
+    def zoom_at_point(self, zoom_delta, zoom_center, steps=1):
+        """Zoom in/out while keeping zoom_center stationary
         
-    def zoom_at_point(self, zoom_delta, zoom_center):
-        """Zoom in/out while keeping zoom_center stationary"""
+        ``steps`` applies several wheel steps in the direction of
+        ``zoom_delta`` as one zoom change.
+        """
         old_zoom = self.zoom_manager.get_zoom_factor()
         
         # Apply zoom
+        step = 1.15 ** steps
         if zoom_delta > 0:
-            new_zoom = old_zoom * 1.15  # Zoom in
+            new_zoom = old_zoom * step  # Zoom in
         else:
-            new_zoom = old_zoom / 1.15  # Zoom out
+            new_zoom = old_zoom / step  # Zoom out
             
         new_zoom = self.zoom_manager.set_zoom_factor(new_zoom)
         
         if abs(new_zoom - old_zoom) > 0.001:
             # Adjust pan to keep zoom center stationary
             current_pan = self.pan_manager.get_pan_offset()
+            center_x, center_y = zoom_center.x(), zoom_center.y()
             
             # Calculate how much the zoom center moved
             zoom_ratio = new_zoom / old_zoom
-            center_offset = zoom_center - current_pan
-            new_center_offset = center_offset * zoom_ratio
-            new_pan = zoom_center - new_center_offset
+            new_pan_x = center_x - (center_x - current_pan.x()) * zoom_ratio
+            new_pan_y = center_y - (center_y - current_pan.y()) * zoom_ratio
             
-            self.pan_manager.set_pan_offset(new_pan)
+            self.pan_manager.set_pan_offset(QtCore.QPointF(new_pan_x, new_pan_y))
             
     def fit_items_in_view(self, items, viewport_rect, margin=0.1):
         """Fit items in viewport with optional margin"""
@@ -362,27 +558,24 @@ class ViewportManager(QtCore.QObject):
             return
             
         # Calculate bounding rectangle
-        bounding_rect = QtCore.QRectF()
+        bounds = []
+        append = bounds.append
+        QGraphicsItem = QtWidgets.QGraphicsItem
         for item in items:
-            if hasattr(item, 'sceneBoundingRect'):
+            if isinstance(item, QGraphicsItem) or hasattr(item, 'sceneBoundingRect'):
                 item_rect = item.sceneBoundingRect()
+                x0, y0 = item_rect.x(), item_rect.y()
             elif hasattr(item, 'boundingRect') and hasattr(item, 'pos'):
                 item_rect = item.boundingRect()
                 item_pos = item.pos()
-                item_rect = QtCore.QRectF(
-                    item_pos.x() + item_rect.x(),
-                    item_pos.y() + item_rect.y(),
-                    item_rect.width(),
-                    item_rect.height()
-                )
+                x0 = item_pos.x() + item_rect.x()
+                y0 = item_pos.y() + item_rect.y()
             else:
                 continue
                 
-            if bounding_rect.isEmpty():
-                bounding_rect = item_rect
-            else:
-                bounding_rect = bounding_rect.united(item_rect)
-                
+            append((x0, y0, x0 + item_rect.width(), y0 + item_rect.height()))
+            
+        bounding_rect = _united_bounds(bounds)
         if bounding_rect.isEmpty():
             return
             
@@ -418,12 +611,15 @@ class GridSystem(QtCore.QObject):
     def __init__(self, parent=None):
         super(GridSystem, self).__init__(parent)
         self._grid_size = 10
+        self._inv_grid_size = 0.1
         self._snap_enabled = False
         self._visible = False
+        self._lines_capped = False  # Limit already reported
         
     def set_grid_size(self, size):
         """Set grid size"""
         self._grid_size = max(1, size)
+        self._inv_grid_size = 1.0 / self._grid_size
         
     def get_grid_size(self):
         """Get grid size"""
@@ -445,50 +641,107 @@ class GridSystem(QtCore.QObject):
         """Check if grid is visible"""
         return self._visible
         
-    def snap_to_grid(self, point):
-        """Snap point to grid"""
+    def snap_to_grid(self, point, out=None):
+        """Snap point to grid
+        
+        If ``out`` is given the snapped position is written into it instead
+        of a new QPointF. With snapping disabled ``point`` is returned as-is.
+        """
         if not self._snap_enabled:
             return point
             
-        snapped_x = round(point.x() / self._grid_size) * self._grid_size
-        snapped_y = round(point.y() / self._grid_size) * self._grid_size
+        grid_size = self._grid_size
+        inv_grid_size = self._inv_grid_size
         
-        return QtCore.QPointF(snapped_x, snapped_y)
+        return _set_point(
+            out,
+            round(point.x() * inv_grid_size) * grid_size,
+            round(point.y() * inv_grid_size) * grid_size
+        )
         
     def get_grid_lines(self, viewport_rect, transform):
-        """Get grid lines for drawing"""
+        """Get grid lines for drawing
+        
+        Returns (vertical, horizontal) lists of QLineF, ready to pass to
+        QPainter.drawLines in one call each.
+        """
         if not self._visible:
-            return [], []
+            return _EMPTY_LINES
             
         # Transform viewport to scene coordinates
         inverse_transform, invertible = transform.inverted()
         if not invertible:
-            return [], []
+            return _EMPTY_LINES
             
         scene_rect = inverse_transform.mapRect(viewport_rect)
         
         # Calculate grid line positions
-        start_x = math.floor(scene_rect.left() / self._grid_size) * self._grid_size
-        end_x = math.ceil(scene_rect.right() / self._grid_size) * self._grid_size
-        start_y = math.floor(scene_rect.top() / self._grid_size) * self._grid_size
-        end_y = math.ceil(scene_rect.bottom() / self._grid_size) * self._grid_size
+        grid_size = self._grid_size
+        floor, ceil = math.floor, math.ceil
+        start_x = floor(scene_rect.left() / grid_size) * grid_size
+        end_x = ceil(scene_rect.right() / grid_size) * grid_size
+        start_y = floor(scene_rect.top() / grid_size) * grid_size
+        end_y = ceil(scene_rect.bottom() / grid_size) * grid_size
+        
+        # Too dense to draw (extreme zoom-out); skip rather than build a
+        # huge list of lines every paint
+        line_count = (end_x - start_x + end_y - start_y) / grid_size
+        if line_count > MAX_GRID_LINES:
+            if not self._lines_capped:
+                print(f"Grid hidden: {int(line_count)} lines exceeds limit of {MAX_GRID_LINES}")
+                self._lines_capped = True
+            return _EMPTY_LINES
+        self._lines_capped = False
+        
+        if np is not None and transform.isAffine():
+            return self._get_grid_lines_vectorized(
+                transform, scene_rect, start_x, end_x, start_y, end_y
+            )
+            
+        # Bind loop-invariant lookups to locals
+        QPointF = QtCore.QPointF
+        QLineF = QtCore.QLineF
+        tmap = transform.map
+        top, bottom = scene_rect.top(), scene_rect.bottom()
+        left, right = scene_rect.left(), scene_rect.right()
         
         # Generate vertical lines
         vertical_lines = []
+        append = vertical_lines.append
         x = start_x
         while x <= end_x:
-            line_start = transform.map(QtCore.QPointF(x, scene_rect.top()))
-            line_end = transform.map(QtCore.QPointF(x, scene_rect.bottom()))
-            vertical_lines.append((line_start, line_end))
-            x += self._grid_size
+            append(QLineF(tmap(QPointF(x, top)), tmap(QPointF(x, bottom))))
+            x += grid_size
             
         # Generate horizontal lines
         horizontal_lines = []
+        append = horizontal_lines.append
         y = start_y
         while y <= end_y:
-            line_start = transform.map(QtCore.QPointF(scene_rect.left(), y))
-            line_end = transform.map(QtCore.QPointF(scene_rect.right(), y))
-            horizontal_lines.append((line_start, line_end))
-            y += self._grid_size
+            append(QLineF(tmap(QPointF(left, y)), tmap(QPointF(right, y))))
+            y += grid_size
             
         return vertical_lines, horizontal_lines
+        
+    def _get_grid_lines_vectorized(self, transform, scene_rect, start_x, end_x, start_y, end_y):
+        """Compute grid line endpoints for an affine transform with NumPy"""
+        grid_size = self._grid_size
+        m11, m12 = transform.m11(), transform.m12()
+        m21, m22 = transform.m21(), transform.m22()
+        dx, dy = transform.dx(), transform.dy()
+        top, bottom = scene_rect.top(), scene_rect.bottom()
+        left, right = scene_rect.left(), scene_rect.right()
+        
+        # Half a step of slack so end values are kept despite rounding
+        xs = np.arange(start_x, end_x + grid_size * 0.5, grid_size)
+        ys = np.arange(start_y, end_y + grid_size * 0.5, grid_size)
+        
+        # Map (x, top) / (x, bottom); horizontal lines are the same mapping
+        # with the roles of x and y (and so of the matrix columns) swapped
+        vertical = _grid_endpoints(m11, m12, m21, m22, dx, dy, xs, top, bottom).tolist()
+        horizontal = _grid_endpoints(m21, m22, m11, m12, dx, dy, ys, left, right).tolist()
+        
+        QLineF = QtCore.QLineF
+        vertical_lines = [QLineF(x0, y0, x1, y1) for x0, y0, x1, y1 in vertical]
+        horizontal_lines = [QLineF(x0, y0, x1, y1) for x0, y0, x1, y1 in horizontal]
+        return vertical_lines, horizontal_lines
@@ -4,13 +4,461 @@ Style Manager for Ultimate Animation Picker
 Manages themes, styles, and visual consistency across the application
 """
 
+import collections
+import functools
 import json
 import os
+from types import MappingProxyType
 from PySide2 import QtCore, QtGui, QtWidgets
 from PySide2.QtCore import Signal
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# Theme file JSON helpers, using orjson when it is available
+if orjson is not None:
+    def _dumps(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    _loads = orjson.loads
+else:
+    def _dumps(obj):
+        return json.dumps(obj, indent=2).encode('utf-8')
+    _loads = json.loads
+
+
+def _jit(func):
+    """Compile an arithmetic kernel with Numba when it is available"""
+    if numba is None:
+        return func
+    return numba.njit(cache=True)(func)
+
+
+# Image palettes are counted at 5 bits per channel: 2^15 histogram bins
+_PALETTE_BITS = 5
+_PALETTE_SHIFT = 8 - _PALETTE_BITS
+_PALETTE_BINS = 1 << (3 * _PALETTE_BITS)
+
+
+@_jit
+def _quantized_color_histogram(arr):
+    """Histogram a uint8 (H, W, 3) array over 15-bit RGB keys"""
+    hist = np.zeros(1 << 15, np.int64)
+    for i in range(arr.shape[0]):
+        for j in range(arr.shape[1]):
+            key = (((np.int64(arr[i, j, 0]) >> 3) << 10) |
+                   ((np.int64(arr[i, j, 1]) >> 3) << 5) |
+                   (np.int64(arr[i, j, 2]) >> 3))
+            hist[key] += 1
+    return hist
+
+
+# Theme values referenced by the stylesheet templates below
+_TEMPLATE_COLOR_KEYS = (
+    'background', 'canvas_background', 'button_normal', 'button_hover',
+    'button_pressed', 'button_selected', 'text_normal', 'text_disabled',
+    'border_normal', 'border_selected', 'accent'
+)
+_TEMPLATE_SIZE_KEYS = ('border_radius', 'button_height')
+
+# Hex name of QtCore.Qt.gray, used when a theme lacks a color
+_FALLBACK_COLOR_NAME = '#a0a0a4'
+
+_QPUSHBUTTON_TPL = """
+    QPushButton {{
+        background-color: {button_normal};
+        color: {text_normal};
+        border: 1px solid {border_normal};
+        border-radius: {border_radius}px;
+        padding: 4px 8px;
+        min-height: {button_height_m8}px;
+    }}
+    QPushButton:hover {{
+        background-color: {button_hover};
+    }}
+    QPushButton:pressed {{
+        background-color: {button_pressed};
+    }}
+    QPushButton:checked {{
+        background-color: {button_selected};
+        border-color: {border_selected};
+    }}
+    QPushButton:disabled {{
+        color: {text_disabled};
+        background-color: {button_normal};
+        opacity: 0.5;
+    }}
+"""
+
+_QTABBAR_TPL = """
+    QTabBar::tab {{
+        background-color: {button_normal};
+        color: {text_normal};
+        border: 1px solid {border_normal};
+        border-bottom: none;
+        padding: 4px 12px;
+        margin-right: 2px;
+    }}
+    QTabBar::tab:selected {{
+        background-color: {button_selected};
+        border-color: {border_selected};
+    }}
+    QTabBar::tab:hover {{
+        background-color: {button_hover};
+    }}
+"""
+
+_QGROUPBOX_TPL = """
+    QGroupBox {{
+        font-weight: bold;
+        border: 1px solid {border_normal};
+        border-radius: {border_radius}px;
+        margin: 8px 0px;
+        padding-top: 8px;
+        color: {text_normal};
+    }}
+    QGroupBox::title {{
+        subcontrol-origin: margin;
+        left: 8px;
+        padding: 0 4px 0 4px;
+    }}
+"""
+
+_QLINEEDIT_TPL = """
+    QLineEdit {{
+        background-color: {canvas_background};
+        color: {text_normal};
+        border: 1px solid {border_normal};
+        border-radius: {border_radius}px;
+        padding: 4px;
+        selection-background-color: {button_selected};
+    }}
+    QLineEdit:focus {{
+        border-color: {border_selected};
+    }}
+"""
+
+_QTEXTEDIT_TPL = """
+    QTextEdit {{
+        background-color: {canvas_background};
+        color: {text_normal};
+        border: 1px solid {border_normal};
+        border-radius: {border_radius}px;
+        selection-background-color: {button_selected};
+    }}
+    QTextEdit:focus {{
+        border-color: {border_selected};
+    }}
+"""
+
+_QCOMBOBOX_TPL = """
+    QComboBox {{
+        background-color: {button_normal};
+        color: {text_normal};
+        border: 1px solid {border_normal};
+        border-radius: {border_radius}px;
+        padding: 4px;
+        min-height: {button_height_m8}px;
+    }}
+    QComboBox:hover {{
+        background-color: {button_hover};
+    }}
+    QComboBox::drop-down {{
+        border: none;
+        width: 20px;
+    }}
+    QComboBox::down-arrow {{
+        image: none;
+        border-left: 4px solid transparent;
+        border-right: 4px solid transparent;
+        border-top: 4px solid {text_normal};
+    }}
+"""
+
+_QSLIDER_TPL = """
+    QSlider::groove:horizontal {{
+        border: 1px solid {border_normal};
+        height: 6px;
+        background: {canvas_background};
+        border-radius: 3px;
+    }}
+    QSlider::handle:horizontal {{
+        background: {button_selected};
+        border: 1px solid {border_selected};
+        width: 16px;
+        height: 16px;
+        margin: -6px 0;
+        border-radius: 8px;
+    }}
+    QSlider::handle:horizontal:hover {{
+        background: {accent};
+    }}
+"""
+
+_QSPINBOX_TPL = """
+    QSpinBox {{
+        background-color: {canvas_background};
+        color: {text_normal};
+        border: 1px solid {border_normal};
+        border-radius: {border_radius}px;
+        padding: 4px;
+        min-height: {button_height_m8}px;
+    }}
+    QSpinBox:focus {{
+        border-color: {border_selected};
+    }}
+    QSpinBox::up-button, QSpinBox::down-button {{
+        background-color: {button_normal};
+        border: 1px solid {border_normal};
+        width: 16px;
+    }}
+    QSpinBox::up-button:hover, QSpinBox::down-button:hover {{
+        background-color: {button_hover};
+    }}
+"""
+
+_QCHECKBOX_TPL = """
+    QCheckBox {{
+        color: {text_normal};
+        spacing: 8px;
+    }}
+    QCheckBox::indicator {{
+        width: 16px;
+        height: 16px;
+        border: 1px solid {border_normal};
+        border-radius: 2px;
+        background-color: {canvas_background};
+    }}
+    QCheckBox::indicator:checked {{
+        background-color: {button_selected};
+        border-color: {border_selected};
+    }}
+    QCheckBox::indicator:hover {{
+        border-color: {border_selected};
+    }}
+"""
+
+# Application-wide chrome, applied ahead of the widget templates
+_GLOBAL_CHROME_TPL = """
+    QMainWindow {{
+        background-color: {background};
+        color: {text_normal};
+    }}
+    QWidget {{
+        background-color: {background};
+        color: {text_normal};
+    }}
+    QMenuBar {{
+        background-color: {background};
+        color: {text_normal};
+        border-bottom: 1px solid {border_normal};
+    }}
+    QMenuBar::item {{
+        background-color: transparent;
+        padding: 4px 8px;
+    }}
+    QMenuBar::item:selected {{
+        background-color: {button_hover};
+    }}
+    QMenu {{
+        background-color: {background};
+        color: {text_normal};
+        border: 1px solid {border_normal};
+    }}
+    QMenu::item {{
+        padding: 4px 16px;
+    }}
+    QMenu::item:selected {{
+        background-color: {button_hover};
+    }}
+    QStatusBar {{
+        background-color: {background};
+        color: {text_normal};
+        border-top: 1px solid {border_normal};
+    }}
+    QToolBar {{
+        background-color: {background};
+        border: 1px solid {border_normal};
+        spacing: 2px;
+    }}
+    QDockWidget {{
+        color: {text_normal};
+        titlebar-close-icon: none;
+        titlebar-normal-icon: none;
+    }}
+    QDockWidget::title {{
+        background-color: {button_normal};
+        padding: 4px;
+        border-bottom: 1px solid {border_normal};
+    }}
+"""
+
+# Widget stylesheet templates, filled from the resolved theme values
+_TEMPLATES = {
+    'QPushButton': _QPUSHBUTTON_TPL,
+    'QTabBar': _QTABBAR_TPL,
+    'QGroupBox': _QGROUPBOX_TPL,
+    'QLineEdit': _QLINEEDIT_TPL,
+    'QTextEdit': _QTEXTEDIT_TPL,
+    'QComboBox': _QCOMBOBOX_TPL,
+    'QSlider': _QSLIDER_TPL,
+    'QSpinBox': _QSPINBOX_TPL,
+    'QCheckBox': _QCHECKBOX_TPL,
+}
+
+
+# Default theme palettes, kept as hex strings until a QColor is requested
+_DEFAULT_PALETTES = {
+    'Default': {
+        'background': '#3E3E3E',
+        'canvas_background': '#2D2D2D',
+        'button_normal': '#5A5A5A',
+        'button_hover': '#6A6A6A',
+        'button_pressed': '#4A4A4A',
+        'button_selected': '#4A90E2',
+        'text_normal': '#FFFFFF',
+        'text_disabled': '#888888',
+        'border_normal': '#666666',
+        'border_selected': '#4A90E2',
+        'grid_lines': '#444444',
+        'selection_box': '#4A90E2',
+        'accent': '#FF9500',
+        'success': '#4CAF50',
+        'warning': '#FF9800',
+        'error': '#F44336',
+    },
+    'Dark': {
+        'background': '#1E1E1E',
+        'canvas_background': '#0D1117',
+        'button_normal': '#2D2D2D',
+        'button_hover': '#404040',
+        'button_pressed': '#1A1A1A',
+        'button_selected': '#0E7DB8',
+        'text_normal': '#E6E6E6',
+        'text_disabled': '#6E6E6E',
+        'border_normal': '#444444',
+        'border_selected': '#0E7DB8',
+        'grid_lines': '#333333',
+        'selection_box': '#0E7DB8',
+        'accent': '#FF6B35',
+        'success': '#28A745',
+        'warning': '#FFC107',
+        'error': '#DC3545',
+    },
+    'Light': {
+        'background': '#F5F5F5',
+        'canvas_background': '#FFFFFF',
+        'button_normal': '#E0E0E0',
+        'button_hover': '#D0D0D0',
+        'button_pressed': '#C0C0C0',
+        'button_selected': '#0078D4',
+        'text_normal': '#333333',
+        'text_disabled': '#999999',
+        'border_normal': '#CCCCCC',
+        'border_selected': '#0078D4',
+        'grid_lines': '#E0E0E0',
+        'selection_box': '#0078D4',
+        'accent': '#FF8C00',
+        'success': '#5CB85C',
+        'warning': '#F0AD4E',
+        'error': '#D9534F',
+    },
+    'Maya': {
+        'background': '#393939',
+        'canvas_background': '#2E2E2E',
+        'button_normal': '#4F4F4F',
+        'button_hover': '#5F5F5F',
+        'button_pressed': '#3F3F3F',
+        'button_selected': '#FF9500',
+        'text_normal': '#CCCCCC',
+        'text_disabled': '#888888',
+        'border_normal': '#666666',
+        'border_selected': '#FF9500',
+        'grid_lines': '#4A4A4A',
+        'selection_box': '#FF9500',
+        'accent': '#00BFFF',
+        'success': '#90EE90',
+        'warning': '#FFD700',
+        'error': '#FF6B6B',
+    },
+}
+
+# Fonts and sizes shared by the default themes. These are read-only; a
+# theme that needs its own values assigns plain dicts instead
+_DEFAULT_FONTS = MappingProxyType({
+    'default': MappingProxyType({'family': 'Arial', 'size': 9}),
+    'small': MappingProxyType({'family': 'Arial', 'size': 8}),
+    'large': MappingProxyType({'family': 'Arial', 'size': 12}),
+    'title': MappingProxyType({'family': 'Arial', 'size': 14, 'bold': True}),
+    'code': MappingProxyType({'family': 'Consolas', 'size': 9})
+})
+_DEFAULT_SIZES = MappingProxyType({
+    'button_height': 24,
+    'toolbar_height': 32,
+    'splitter_width': 4,
+    'margin_small': 4,
+    'margin_medium': 8,
+    'margin_large': 16,
+    'border_radius': 4,
+    'selection_border_width': 2
+})
+
+
+def _dominant_colors(img, count=10):
+    """Get the most frequent image colors as hex strings sorted by lightness"""
+    if np is None:
+        colors = img.getcolors(maxcolors=256*256*256)
+        if not colors:
+            return []
+        colors.sort(key=lambda x: x[0], reverse=True)
+        qt_colors = [QtGui.QColor(*color[1]) for color in colors[:count]]
+        return [c.name() for c in sorted(qt_colors, key=lambda c: c.lightness())]
+        
+    # Histogram 15-bit quantized RGB keys in C instead of per-pixel tuples
+    arr = np.ascontiguousarray(np.asarray(img.convert('RGB')))
+    if numba is not None:
+        hist = _quantized_color_histogram(arr)
+    else:
+        quantized = (arr >> _PALETTE_SHIFT).astype(np.uint16)
+        keys = ((quantized[..., 0] << (2 * _PALETTE_BITS)) |
+                (quantized[..., 1] << _PALETTE_BITS) |
+                quantized[..., 2])
+        hist = np.bincount(keys.ravel(), minlength=_PALETTE_BINS)
+        
+    values = np.flatnonzero(hist)
+    if values.size > count:
+        values = values[np.argpartition(-hist[values], count - 1)[:count]]
+        
+    # Report each bin by its center rather than its darkest corner
+    mask = (1 << _PALETTE_BITS) - 1
+    rgb = np.stack(((values >> (2 * _PALETTE_BITS)) & mask,
+                    (values >> _PALETTE_BITS) & mask,
+                    values & mask), axis=1)
+    rgb = (rgb << _PALETTE_SHIFT) | (1 << (_PALETTE_SHIFT - 1))
+    # HSL lightness is (max + min) / 2; the halving does not change the order
+    rgb = rgb[np.argsort(rgb.max(axis=1) + rgb.min(axis=1), kind='stable')]
+    return ['#%02x%02x%02x' % (r, g, b) for r, g, b in rgb.tolist()]
+
+
 class StyleTheme:
-    """Style theme container"""
+    """Style theme container
+    
+    Colors are stored as color strings (hex names); QColors are built on demand.
+    """
+    
+    __slots__ = ('name', 'colors', 'fonts', 'sizes', 'metadata',
+                 '_font_cache', '_qcolor_cache')
     
     def __init__(self, name, colors=None, fonts=None, sizes=None):
         self.name = name
@@ -18,13 +466,47 @@ class StyleTheme:
         self.fonts = fonts or {}
         self.sizes = sizes or {}
         self.metadata = {}
+        self._font_cache = {}
+        self._qcolor_cache = {}
         
     def get_color(self, color_name, default=None):
         """Get color by name"""
-        return self.colors.get(color_name, default or QtCore.Qt.gray)
+        color = self.get_qcolor(color_name)
+        if color is None:
+            return default or QtCore.Qt.gray
+        return color
+        
+    def get_qcolor(self, color_name):
+        """Get QColor for a stored color value, built on first use"""
+        color = self._qcolor_cache.get(color_name)
+        if color is None:
+            value = self.colors.get(color_name)
+            if value is None:
+                return None
+            color = QtGui.QColor(value)
+            self._qcolor_cache[color_name] = color
+        return color
+        
+    def get_color_name(self, color_name, default=_FALLBACK_COLOR_NAME):
+        """Get hex string for a color without building a QColor"""
+        value = self.colors.get(color_name)
+        if value is None:
+            return default
+        if isinstance(value, str) and len(value) == 7 and value[0] == '#':
+            return value
+        return QtGui.QColor(value).name()
         
     def get_font(self, font_name, default_size=10):
         """Get font by name"""
+        key = (font_name, default_size)
+        font = self._font_cache.get(key)
+        if font is None:
+            font = self._build_font(font_name, default_size)
+            self._font_cache[key] = font
+        return font
+        
+    def _build_font(self, font_name, default_size):
+        """Build QFont from font info"""
         font_info = self.fonts.get(font_name, {})
         family = font_info.get('family', 'Arial')
         size = font_info.get('size', default_size)
@@ -36,6 +518,11 @@ class StyleTheme:
         font.setItalic(italic)
         return font
         
+    def clear_font_cache(self):
+        """Drop cached fonts and colors after editing theme values"""
+        self._font_cache.clear()
+        self._qcolor_cache.clear()
+        
     def get_size(self, size_name, default=10):
         """Get size by name"""
         return self.sizes.get(size_name, default)
@@ -44,26 +531,20 @@ class StyleTheme:
         """Convert to dictionary"""
         return {
             'name': self.name,
-            'colors': {name: color.name() if hasattr(color, 'name') else str(color) 
-                      for name, color in self.colors.items()},
-            'fonts': self.fonts,
-            'sizes': self.sizes,
+            'colors': dict(self.colors),
+            'fonts': {name: dict(info) for name, info in self.fonts.items()},
+            'sizes': dict(self.sizes),
             'metadata': self.metadata
         }
         
     @classmethod
     def from_dict(cls, data):
         """Create from dictionary"""
-        theme = cls(data.get('name', 'Unnamed'))
-        
-        # Convert color strings back to QColor
-        colors = {}
-        for name, color_str in data.get('colors', {}).items():
-            colors[name] = QtGui.QColor(color_str)
-        theme.colors = colors
-        
-        theme.fonts = data.get('fonts', {})
-        theme.sizes = data.get('sizes', {})
+        # Color strings stay as-is; QColors are built on first lookup
+        theme = cls(data.get('name', 'Unnamed'),
+                    dict(data.get('colors', {})),
+                    data.get('fonts', {}),
+                    data.get('sizes', {}))
         theme.metadata = data.get('metadata', {})
         
         return theme
@@ -76,12 +557,20 @@ class StyleManager(QtCore.QObject):
     theme_changed = Signal(str)  # theme_name
     style_updated = Signal()
     
+    # Widget stylesheets kept across theme switches
+    MAX_STYLE_CACHE = 256
+    
     def __init__(self, parent=None):
         super(StyleManager, self).__init__(parent)
         self._themes = {}
         self._current_theme = None
         self._custom_styles = {}
-        self._style_cache = {}
+        self._style_cache = collections.OrderedDict()
+        self._resolved = {}
+        self._color_names = {}
+        self._global_stylesheet = ""
+        self._global_stylesheets = {}
+        self._styled_app = None
         
         # Initialize default themes
         self.create_default_themes()
@@ -89,117 +578,11 @@ class StyleManager(QtCore.QObject):
         
     def create_default_themes(self):
         """Create default application themes"""
-        # Default theme
-        default_theme = StyleTheme('Default')
-        default_theme.colors = {
-            'background': QtGui.QColor('#3E3E3E'),
-            'canvas_background': QtGui.QColor('#2D2D2D'),
-            'button_normal': QtGui.QColor('#5A5A5A'),
-            'button_hover': QtGui.QColor('#6A6A6A'),
-            'button_pressed': QtGui.QColor('#4A4A4A'),
-            'button_selected': QtGui.QColor('#4A90E2'),
-            'text_normal': QtGui.QColor('#FFFFFF'),
-            'text_disabled': QtGui.QColor('#888888'),
-            'border_normal': QtGui.QColor('#666666'),
-            'border_selected': QtGui.QColor('#4A90E2'),
-            'grid_lines': QtGui.QColor('#444444'),
-            'selection_box': QtGui.QColor('#4A90E2'),
-            'accent': QtGui.QColor('#FF9500'),
-            'success': QtGui.QColor('#4CAF50'),
-            'warning': QtGui.QColor('#FF9800'),
-            'error': QtGui.QColor('#F44336')
-        }
-        default_theme.fonts = {
-            'default': {'family': 'Arial', 'size': 9},
-            'small': {'family': 'Arial', 'size': 8},
-            'large': {'family': 'Arial', 'size': 12},
-            'title': {'family': 'Arial', 'size': 14, 'bold': True},
-            'code': {'family': 'Consolas', 'size': 9}
-        }
-        default_theme.sizes = {
-            'button_height': 24,
-            'toolbar_height': 32,
-            'splitter_width': 4,
-            'margin_small': 4,
-            'margin_medium': 8,
-            'margin_large': 16,
-            'border_radius': 4,
-            'selection_border_width': 2
-        }
-        self._themes['Default'] = default_theme
-        
-        # Dark theme
-        dark_theme = StyleTheme('Dark')
-        dark_theme.colors = {
-            'background': QtGui.QColor('#1E1E1E'),
-            'canvas_background': QtGui.QColor('#0D1117'),
-            'button_normal': QtGui.QColor('#2D2D2D'),
-            'button_hover': QtGui.QColor('#404040'),
-            'button_pressed': QtGui.QColor('#1A1A1A'),
-            'button_selected': QtGui.QColor('#0E7DB8'),
-            'text_normal': QtGui.QColor('#E6E6E6'),
-            'text_disabled': QtGui.QColor('#6E6E6E'),
-            'border_normal': QtGui.QColor('#444444'),
-            'border_selected': QtGui.QColor('#0E7DB8'),
-            'grid_lines': QtGui.QColor('#333333'),
-            'selection_box': QtGui.QColor('#0E7DB8'),
-            'accent': QtGui.QColor('#FF6B35'),
-            'success': QtGui.QColor('#28A745'),
-            'warning': QtGui.QColor('#FFC107'),
-            'error': QtGui.QColor('#DC3545')
-        }
-        dark_theme.fonts = default_theme.fonts.copy()
-        dark_theme.sizes = default_theme.sizes.copy()
-        self._themes['Dark'] = dark_theme
-        
-        # Light theme
-        light_theme = StyleTheme('Light')
-        light_theme.colors = {
-            'background': QtGui.QColor('#F5F5F5'),
-            'canvas_background': QtGui.QColor('#FFFFFF'),
-            'button_normal': QtGui.QColor('#E0E0E0'),
-            'button_hover': QtGui.QColor('#D0D0D0'),
-            'button_pressed': QtGui.QColor('#C0C0C0'),
-            'button_selected': QtGui.QColor('#0078D4'),
-            'text_normal': QtGui.QColor('#333333'),
-            'text_disabled': QtGui.QColor('#999999'),
-            'border_normal': QtGui.QColor('#CCCCCC'),
-            'border_selected': QtGui.QColor('#0078D4'),
-            'grid_lines': QtGui.QColor('#E0E0E0'),
-            'selection_box': QtGui.QColor('#0078D4'),
-            'accent': QtGui.QColor('#FF8C00'),
-            'success': QtGui.QColor('#5CB85C'),
-            'warning': QtGui.QColor('#F0AD4E'),
-            'error': QtGui.QColor('#D9534F')
-        }
-        light_theme.fonts = default_theme.fonts.copy()
-        light_theme.sizes = default_theme.sizes.copy()
-        self._themes['Light'] = light_theme
-        
-        # Maya theme
-        maya_theme = StyleTheme('Maya')
-        maya_theme.colors = {
-            'background': QtGui.QColor('#393939'),
-            'canvas_background': QtGui.QColor('#2E2E2E'),
-            'button_normal': QtGui.QColor('#4F4F4F'),
-            'button_hover': QtGui.QColor('#5F5F5F'),
-            'button_pressed': QtGui.QColor('#3F3F3F'),
-            'button_selected': QtGui.QColor('#FF9500'),
-            'text_normal': QtGui.QColor('#CCCCCC'),
-            'text_disabled': QtGui.QColor('#888888'),
-            'border_normal': QtGui.QColor('#666666'),
-            'border_selected': QtGui.QColor('#FF9500'),
-            'grid_lines': QtGui.QColor('#4A4A4A'),
-            'selection_box': QtGui.QColor('#FF9500'),
-            'accent': QtGui.QColor('#00BFFF'),
-            'success': QtGui.QColor('#90EE90'),
-            'warning': QtGui.QColor('#FFD700'),
-            'error': QtGui.QColor('#FF6B6B')
-        }
-        maya_theme.fonts = default_theme.fonts.copy()
-        maya_theme.sizes = default_theme.sizes.copy()
-        self._themes['Maya'] = maya_theme
-        
+        # Fonts and sizes are shared read-only mappings
+        for name, palette in _DEFAULT_PALETTES.items():
+            self._themes[name] = StyleTheme(name, dict(palette),
+                                            _DEFAULT_FONTS, _DEFAULT_SIZES)
+            
     def get_themes(self):
         """Get list of available themes"""
         return list(self._themes.keys())
@@ -214,8 +597,23 @@ class StyleManager(QtCore.QObject):
             old_theme = self._current_theme
             self._current_theme = self._themes[theme_name]
             
-            # Clear style cache
-            self._style_cache.clear()
+            # Route lookups straight to the theme; these instance
+            # attributes shadow the fallback methods below
+            self.get_color = self._current_theme.get_color
+            self.get_font = self._current_theme.get_font
+            self.get_size = self._current_theme.get_size
+            
+            # Resolve template values once; cached stylesheets are keyed by
+            # theme name and stay valid across switches
+            theme = self._current_theme
+            self._color_names = {name: theme.get_color_name(name) for name in theme.colors}
+            self._resolved = self._resolve_theme_values(theme)
+            self._global_stylesheet = self._global_stylesheets.get(theme_name)
+            if self._global_stylesheet is None:
+                self._global_stylesheet = self.build_global_stylesheet()
+                self._global_stylesheets[theme_name] = self._global_stylesheet
+            if self._styled_app is not None:
+                self.apply_theme_to_application(self._styled_app)
             
             # Emit signals
             self.theme_changed.emit(theme_name)
@@ -224,12 +622,26 @@ class StyleManager(QtCore.QObject):
             return True
         return False
         
+    def _resolve_theme_values(self, theme):
+        """Resolve theme colors and sizes into stylesheet template values"""
+        get_size = theme.get_size
+        resolved = dict.fromkeys(_TEMPLATE_COLOR_KEYS, _FALLBACK_COLOR_NAME)
+        resolved.update(self._color_names)
+        for name in _TEMPLATE_SIZE_KEYS:
+            resolved[name] = int(get_size(name))
+        resolved['button_height_m8'] = resolved['button_height'] - 8
+        return resolved
+        
     def get_color(self, color_name, default=None):
         """Get color from current theme"""
         if self._current_theme:
             return self._current_theme.get_color(color_name, default)
         return default or QtCore.Qt.gray
         
+    def get_color_name(self, color_name, default=_FALLBACK_COLOR_NAME):
+        """Get hex string for a current theme color"""
+        return self._color_names.get(color_name, default)
+        
     def get_font(self, font_name, default_size=10):
         """Get font from current theme"""
         if self._current_theme:
@@ -244,273 +656,61 @@ class StyleManager(QtCore.QObject):
         
     def create_stylesheet(self, widget_type):
         """Create stylesheet for widget type"""
-        cache_key = f"{self._current_theme.name}_{widget_type}"
-        if cache_key in self._style_cache:
-            return self._style_cache[cache_key]
-            
-        stylesheet = ""
-        
-        if widget_type == 'QPushButton':
-            stylesheet = f"""
-                QPushButton {{
-                    background-color: {self.get_color('button_normal').name()};
-                    color: {self.get_color('text_normal').name()};
-                    border: 1px solid {self.get_color('border_normal').name()};
-                    border-radius: {self.get_size('border_radius')}px;
-                    padding: 4px 8px;
-                    min-height: {self.get_size('button_height') - 8}px;
-                }}
-                QPushButton:hover {{
-                    background-color: {self.get_color('button_hover').name()};
-                }}
-                QPushButton:pressed {{
-                    background-color: {self.get_color('button_pressed').name()};
-                }}
-                QPushButton:checked {{
-                    background-color: {self.get_color('button_selected').name()};
-                    border-color: {self.get_color('border_selected').name()};
-                }}
-                QPushButton:disabled {{
-                    color: {self.get_color('text_disabled').name()};
-                    background-color: {self.get_color('button_normal').name()};
-                    opacity: 0.5;
-                }}
-            """
-            
-        elif widget_type == 'QTabBar':
-            stylesheet = f"""
-                QTabBar::tab {{
-                    background-color: {self.get_color('button_normal').name()};
-                    color: {self.get_color('text_normal').name()};
-                    border: 1px solid {self.get_color('border_normal').name()};
-                    border-bottom: none;
-                    padding: 4px 12px;
-                    margin-right: 2px;
-                }}
-                QTabBar::tab:selected {{
-                    background-color: {self.get_color('button_selected').name()};
-                    border-color: {self.get_color('border_selected').name()};
-                }}
-                QTabBar::tab:hover {{
-                    background-color: {self.get_color('button_hover').name()};
-                }}
-            """
-            
-        elif widget_type == 'QGroupBox':
-            stylesheet = f"""
-                QGroupBox {{
-                    font-weight: bold;
-                    border: 1px solid {self.get_color('border_normal').name()};
-                    border-radius: {self.get_size('border_radius')}px;
-                    margin: 8px 0px;
-                    padding-top: 8px;
-                    color: {self.get_color('text_normal').name()};
-                }}
-                QGroupBox::title {{
-                    subcontrol-origin: margin;
-                    left: 8px;
-                    padding: 0 4px 0 4px;
-                }}
-            """
-            
-        elif widget_type == 'QLineEdit':
-            stylesheet = f"""
-                QLineEdit {{
-                    background-color: {self.get_color('canvas_background').name()};
-                    color: {self.get_color('text_normal').name()};
-                    border: 1px solid {self.get_color('border_normal').name()};
-                    border-radius: {self.get_size('border_radius')}px;
-                    padding: 4px;
-                    selection-background-color: {self.get_color('button_selected').name()};
-                }}
-                QLineEdit:focus {{
-                    border-color: {self.get_color('border_selected').name()};
-                }}
-            """
-            
-        elif widget_type == 'QTextEdit':
-            stylesheet = f"""
-                QTextEdit {{
-                    background-color: {self.get_color('canvas_background').name()};
-                    color: {self.get_color('text_normal').name()};
-                    border: 1px solid {self.get_color('border_normal').name()};
-                    border-radius: {self.get_size('border_radius')}px;
-                    selection-background-color: {self.get_color('button_selected').name()};
-                }}
-                QTextEdit:focus {{
-                    border-color: {self.get_color('border_selected').name()};
-                }}
-            """
-            
-        elif widget_type == 'QComboBox':
-            stylesheet = f"""
-                QComboBox {{
-                    background-color: {self.get_color('button_normal').name()};
-                    color: {self.get_color('text_normal').name()};
-                    border: 1px solid {self.get_color('border_normal').name()};
-                    border-radius: {self.get_size('border_radius')}px;
-                    padding: 4px;
-                    min-height: {self.get_size('button_height') - 8}px;
-                }}
-                QComboBox:hover {{
-                    background-color: {self.get_color('button_hover').name()};
-                }}
-                QComboBox::drop-down {{
-                    border: none;
-                    width: 20px;
-                }}
-                QComboBox::down-arrow {{
-                    image: none;
-                    border-left: 4px solid transparent;
-                    border-right: 4px solid transparent;
-                    border-top: 4px solid {self.get_color('text_normal').name()};
-                }}
-            """
-            
-        elif widget_type == 'QSlider':
-            stylesheet = f"""
-                QSlider::groove:horizontal {{
-                    border: 1px solid {self.get_color('border_normal').name()};
-                    height: 6px;
-                    background: {self.get_color('canvas_background').name()};
-                    border-radius: 3px;
-                }}
-                QSlider::handle:horizontal {{
-                    background: {self.get_color('button_selected').name()};
-                    border: 1px solid {self.get_color('border_selected').name()};
-                    width: 16px;
-                    height: 16px;
-                    margin: -6px 0;
-                    border-radius: 8px;
-                }}
-                QSlider::handle:horizontal:hover {{
-                    background: {self.get_color('accent').name()};
-                }}
-            """
-            
-        elif widget_type == 'QSpinBox':
-            stylesheet = f"""
-                QSpinBox {{
-                    background-color: {self.get_color('canvas_background').name()};
-                    color: {self.get_color('text_normal').name()};
-                    border: 1px solid {self.get_color('border_normal').name()};
-                    border-radius: {self.get_size('border_radius')}px;
-                    padding: 4px;
-                    min-height: {self.get_size('button_height') - 8}px;
-                }}
-                QSpinBox:focus {{
-                    border-color: {self.get_color('border_selected').name()};
-                }}
-                QSpinBox::up-button, QSpinBox::down-button {{
-                    background-color: {self.get_color('button_normal').name()};
-                    border: 1px solid {self.get_color('border_normal').name()};
-                    width: 16px;
-                }}
-                QSpinBox::up-button:hover, QSpinBox::down-button:hover {{
-                    background-color: {self.get_color('button_hover').name()};
-                }}
-            """
-            
-        elif widget_type == 'QCheckBox':
-            stylesheet = f"""
-                QCheckBox {{
-                    color: {self.get_color('text_normal').name()};
-                    spacing: 8px;
-                }}
-                QCheckBox::indicator {{
-                    width: 16px;
-                    height: 16px;
-                    border: 1px solid {self.get_color('border_normal').name()};
-                    border-radius: 2px;
-                    background-color: {self.get_color('canvas_background').name()};
-                }}
-                QCheckBox::indicator:checked {{
-                    background-color: {self.get_color('button_selected').name()};
-                    border-color: {self.get_color('border_selected').name()};
-                }}
-                QCheckBox::indicator:hover {{
-                    border-color: {self.get_color('border_selected').name()};
-                }}
-            """
+        cache_key = (self._current_theme.name, widget_type)
+        stylesheet = self._style_cache.get(cache_key)
+        if stylesheet is not None:
+            self._style_cache.move_to_end(cache_key)
+            return stylesheet
             
+        template = _TEMPLATES.get(widget_type)
+        stylesheet = template.format_map(self._resolved) if template else ""
+        
         # Cache the stylesheet
         self._style_cache[cache_key] = stylesheet
+        if len(self._style_cache) > self.MAX_STYLE_CACHE:
+            self._style_cache.popitem(last=False)
         return stylesheet
         
+    def _forget_theme_styles(self, theme_name):
+        """Drop cached stylesheets for a theme that was replaced"""
+        self._global_stylesheets.pop(theme_name, None)
+        for key in [key for key in self._style_cache if key[0] == theme_name]:
+            del self._style_cache[key]
+            
+    def build_global_stylesheet(self):
+        """Build the combined application stylesheet for the current theme"""
+        parts = [_GLOBAL_CHROME_TPL.format_map(self._resolved)]
+        parts.extend(self.create_stylesheet(widget_type) for widget_type in _TEMPLATES)
+        return "\n".join(parts)
+        
     def apply_theme_to_widget(self, widget, widget_type=None):
         """Apply current theme to widget"""
-        if widget_type is None:
-            widget_type = widget.__class__.__name__
-            
-        stylesheet = self.create_stylesheet(widget_type)
-        if stylesheet:
-            widget.setStyleSheet(stylesheet)
+        # Once the application carries the combined stylesheet, Qt cascades
+        # it to every widget; drop any per-widget sheet set before that so a
+        # stale theme does not override it
+        if self._styled_app is not None:
+            if widget.styleSheet():
+                widget.setStyleSheet("")
+        else:
+            if widget_type is None:
+                widget_type = widget.__class__.__name__
+                
+            stylesheet = self.create_stylesheet(widget_type)
+            if stylesheet:
+                widget.setStyleSheet(stylesheet)
             
-        # Apply font
+        # Apply font, skipping widgets that already resolve to it (e.g. by
+        # inheriting it from a themed parent) to avoid a style recalculation
         font = self.get_font('default')
-        widget.setFont(font)
+        if widget.font().key() != font.key():
+            widget.setFont(font)
         
     def apply_theme_to_application(self, app):
         """Apply current theme to entire application"""
         # Set application font
         app.setFont(self.get_font('default'))
-        
-        # Create global stylesheet
-        global_stylesheet = f"""
-            QMainWindow {{
-                background-color: {self.get_color('background').name()};
-                color: {self.get_color('text_normal').name()};
-            }}
-            QWidget {{
-                background-color: {self.get_color('background').name()};
-                color: {self.get_color('text_normal').name()};
-            }}
-            QMenuBar {{
-                background-color: {self.get_color('background').name()};
-                color: {self.get_color('text_normal').name()};
-                border-bottom: 1px solid {self.get_color('border_normal').name()};
-            }}
-            QMenuBar::item {{
-                background-color: transparent;
-                padding: 4px 8px;
-            }}
-            QMenuBar::item:selected {{
-                background-color: {self.get_color('button_hover').name()};
-            }}
-            QMenu {{
-                background-color: {self.get_color('background').name()};
-                color: {self.get_color('text_normal').name()};
-                border: 1px solid {self.get_color('border_normal').name()};
-            }}
-            QMenu::item {{
-                padding: 4px 16px;
-            }}
-            QMenu::item:selected {{
-                background-color: {self.get_color('button_hover').name()};
-            }}
-            QStatusBar {{
-                background-color: {self.get_color('background').name()};
-                color: {self.get_color('text_normal').name()};
-                border-top: 1px solid {self.get_color('border_normal').name()};
-            }}
-            QToolBar {{
-                background-color: {self.get_color('background').name()};
-                border: 1px solid {self.get_color('border_normal').name()};
-                spacing: 2px;
-            }}
-            QDockWidget {{
-                color: {self.get_color('text_normal').name()};
-                titlebar-close-icon: none;
-                titlebar-normal-icon: none;
-            }}
-            QDockWidget::title {{
-                background-color: {self.get_color('button_normal').name()};
-                padding: 4px;
-                border-bottom: 1px solid {self.get_color('border_normal').name()};
-            }}
-        """
-        
-        app.setStyleSheet(global_stylesheet)
+        app.setStyleSheet(self._global_stylesheet)
+        self._styled_app = app
         
     def create_custom_style(self, name, base_style=None):
         """Create custom style based on existing style"""
@@ -537,8 +737,8 @@ class StyleManager(QtCore.QObject):
             
         try:
             theme_data = self._themes[theme_name].to_dict()
-            with open(file_path, 'w') as f:
-                json.dump(theme_data, f, indent=2)
+            with open(file_path, 'wb') as f:
+                f.write(_dumps(theme_data))
             return True
         except Exception as e:
             print(f"Error saving theme: {e}")
@@ -547,11 +747,12 @@ class StyleManager(QtCore.QObject):
     def load_theme(self, file_path):
         """Load theme from file"""
         try:
-            with open(file_path, 'r') as f:
-                theme_data = json.load(f)
+            with open(file_path, 'rb') as f:
+                theme_data = _loads(f.read())
                 
             theme = StyleTheme.from_dict(theme_data)
             self._themes[theme.name] = theme
+            self._forget_theme_styles(theme.name)
             return theme.name
             
         except Exception as e:
@@ -568,30 +769,19 @@ class StyleManager(QtCore.QObject):
         """Create color scheme from image colors"""
         try:
             from PIL import Image
-            import colorsys
             
             # Open and resize image
             img = Image.open(image_path)
             img = img.resize((150, 150))
             
-            # Get dominant colors
-            colors = img.getcolors(maxcolors=256*256*256)
-            if not colors:
+            # Get dominant colors, sorted by brightness
+            sorted_colors = _dominant_colors(img)
+            if not sorted_colors:
                 return False
                 
-            # Sort by frequency and get top colors
-            colors.sort(key=lambda x: x[0], reverse=True)
-            dominant_colors = [color[1] for color in colors[:10]]
-            
             # Create theme with extracted colors
             theme = StyleTheme(theme_name)
             
-            # Convert colors and assign to theme
-            qt_colors = [QtGui.QColor(*color) for color in dominant_colors]
-            
-            # Assign colors based on brightness
-            sorted_colors = sorted(qt_colors, key=lambda c: c.lightness())
-            
             theme.colors = {
                 'background': sorted_colors[1],
                 'canvas_background': sorted_colors[0],
@@ -607,11 +797,11 @@ class StyleManager(QtCore.QObject):
             }
             
             # Use default fonts and sizes
-            default_theme = self._themes['Default']
-            theme.fonts = default_theme.fonts.copy()
-            theme.sizes = default_theme.sizes.copy()
+            theme.fonts = _DEFAULT_FONTS
+            theme.sizes = _DEFAULT_SIZES
             
             self._themes[theme_name] = theme
+            self._forget_theme_styles(theme_name)
             return True
             
         except Exception as e:
@@ -619,9 +809,39 @@ class StyleManager(QtCore.QObject):
             return False
 
 
+# Immutable per-item style; fields match the item style properties
+ItemStyle = collections.namedtuple('ItemStyle', (
+    'bg_color', 'bg_hover_color', 'bg_click_color',
+    'border_color', 'border_hover_color', 'border_click_color',
+    'text_color', 'text_hover_color', 'text_click_color',
+    'border_width', 'font_family', 'font_size', 'font_bold', 'font_italic'
+))
+
+# Item class -> ((field index, attribute name), ...) resolved once per class
+_STYLE_SETTERS = {}
+
+
+def _get_style_setters(item):
+    """Get the attribute each ItemStyle field is written to for item's class"""
+    item_class = type(item)
+    setters = _STYLE_SETTERS.get(item_class)
+    if setters is None:
+        setters = []
+        for index, prop in enumerate(ItemStyle._fields):
+            if hasattr(item, prop):
+                setters.append((index, prop))
+            elif hasattr(item, f'_{prop}'):
+                setters.append((index, f'_{prop}'))
+        setters = tuple(setters)
+        _STYLE_SETTERS[item_class] = setters
+    return setters
+
+
 class ItemStyleManager:
     """Manages styles for picker items"""
     
+    __slots__ = ('style_manager', '_item_styles')
+    
     def __init__(self, style_manager):
         self.style_manager = style_manager
         self._item_styles = {}
@@ -631,22 +851,23 @@ class ItemStyleManager:
         if item_type not in self._item_styles:
             self._item_styles[item_type] = {}
             
-        style = {
-            'bg_color': self.style_manager.get_color('button_normal'),
-            'bg_hover_color': self.style_manager.get_color('button_hover'),
-            'bg_click_color': self.style_manager.get_color('button_pressed'),
-            'border_color': self.style_manager.get_color('border_normal'),
-            'border_hover_color': self.style_manager.get_color('border_selected'),
-            'border_click_color': self.style_manager.get_color('border_selected'),
-            'text_color': self.style_manager.get_color('text_normal'),
-            'text_hover_color': self.style_manager.get_color('text_normal'),
-            'text_click_color': self.style_manager.get_color('text_normal'),
-            'border_width': 1,
-            'font_family': 'Arial',
-            'font_size': 10,
-            'font_bold': False,
-            'font_italic': False
-        }
+        get_color = self.style_manager.get_color
+        style = ItemStyle(
+            bg_color=get_color('button_normal'),
+            bg_hover_color=get_color('button_hover'),
+            bg_click_color=get_color('button_pressed'),
+            border_color=get_color('border_normal'),
+            border_hover_color=get_color('border_selected'),
+            border_click_color=get_color('border_selected'),
+            text_color=get_color('text_normal'),
+            text_hover_color=get_color('text_normal'),
+            text_click_color=get_color('text_normal'),
+            border_width=1,
+            font_family='Arial',
+            font_size=10,
+            font_bold=False,
+            font_italic=False
+        )
         
         self._item_styles[item_type][style_name] = style
         return style
@@ -664,25 +885,18 @@ class ItemStyleManager:
             
         style = self.get_item_style(item_type, style_name)
         
-        for prop, value in style.items():
-            if hasattr(item, prop):
-                setattr(item, prop, value)
-            elif hasattr(item, f'_{prop}'):
-                setattr(item, f'_{prop}', value)
+        for index, attr in _get_style_setters(item):
+            setattr(item, attr, style[index])
                 
         if hasattr(item, 'update'):
             item.update()
 
 
-# Global style manager instance
-_style_manager = None
-
+# Global style manager instance, created on first call
+@functools.lru_cache(maxsize=1)
 def get_style_manager():
     """Get global style manager instance"""
-    global _style_manager
-    if _style_manager is None:
-        _style_manager = StyleManager()
-    return _style_manager
+    return StyleManager()
 
 def apply_theme_to_widget(widget, widget_type=None):
     """Convenience function to apply theme to widget"""
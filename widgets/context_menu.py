@@ -4,53 +4,229 @@ Context Menu System for Ultimate Animation Picker
 Provides context-sensitive menus for canvas and items
 """
 
+from functools import lru_cache, partial
 from PySide2 import QtWidgets, QtCore, QtGui
 from PySide2.QtCore import Signal
 import maya.cmds as cmds
+import maya.utils as mu
+from ..core.alignment_tools import AlignmentTools
+from ..items.base_item import CAP_TEXT, CAP_COMMAND, CAP_POSE, CAP_ZORDER
+from ..utils.clipboard_manager import get_clipboard_manager
+
+# Object name shared by all picker context menus
+MENU_OBJECT_NAME = "UAPContextMenu"
+
+# Menu colors, applied through a palette and proxy style instead of a
+# stylesheet so menus skip Qt's QSS polish pass
+_MENU_BACKGROUND = "#3E3E3E"
+_MENU_TEXT = "#FFFFFF"
+_MENU_BORDER = "#666666"
+_MENU_HIGHLIGHT = "#4A90E2"
+_MENU_DISABLED_TEXT = "#888888"
+
+
+class PickerMenuStyle(QtWidgets.QProxyStyle):
+    """Proxy style drawing the picker menu panel and selection"""
+    
+    def drawPrimitive(self, element, option, painter, widget=None):
+        """Draw the menu panel as a flat background with a border"""
+        if element == QtWidgets.QStyle.PE_PanelMenu:
+            painter.save()
+            painter.setPen(QtGui.QColor(_MENU_BORDER))
+            painter.setBrush(option.palette.color(QtGui.QPalette.Window))
+            painter.drawRect(option.rect.adjusted(0, 0, -1, -1))
+            painter.restore()
+            return
+        super(PickerMenuStyle, self).drawPrimitive(element, option, painter, widget)
+        
+    def drawControl(self, element, option, painter, widget=None):
+        """Draw the selected menu item as a rounded highlight"""
+        if (element == QtWidgets.QStyle.CE_MenuItem
+                and option.state & QtWidgets.QStyle.State_Selected
+                and option.state & QtWidgets.QStyle.State_Enabled):
+            painter.save()
+            painter.setRenderHint(QtGui.QPainter.Antialiasing)
+            painter.setPen(QtCore.Qt.NoPen)
+            painter.setBrush(option.palette.color(QtGui.QPalette.Highlight))
+            painter.drawRoundedRect(QtCore.QRectF(option.rect).adjusted(2, 0, -2, 0), 4, 4)
+            painter.restore()
+        super(PickerMenuStyle, self).drawControl(element, option, painter, widget)
+
+
+@lru_cache(maxsize=1)
+def _menu_style():
+    """Get the shared menu style, created once a QApplication exists"""
+    return PickerMenuStyle(QtWidgets.QStyleFactory.create("Fusion"))
+
+
+@lru_cache(maxsize=1)
+def _menu_palette():
+    """Get the shared menu palette"""
+    palette = QtGui.QPalette()
+    background = QtGui.QColor(_MENU_BACKGROUND)
+    text = QtGui.QColor(_MENU_TEXT)
+    disabled_text = QtGui.QColor(_MENU_DISABLED_TEXT)
+    palette.setColor(QtGui.QPalette.Window, background)
+    palette.setColor(QtGui.QPalette.Base, background)
+    palette.setColor(QtGui.QPalette.WindowText, text)
+    palette.setColor(QtGui.QPalette.Text, text)
+    palette.setColor(QtGui.QPalette.ButtonText, text)
+    palette.setColor(QtGui.QPalette.Highlight, QtGui.QColor(_MENU_HIGHLIGHT))
+    palette.setColor(QtGui.QPalette.HighlightedText, text)
+    for role in (QtGui.QPalette.WindowText, QtGui.QPalette.Text, QtGui.QPalette.ButtonText):
+        palette.setColor(QtGui.QPalette.Disabled, role, disabled_text)
+    palette.setColor(QtGui.QPalette.Light, QtGui.QColor(_MENU_BORDER))
+    palette.setColor(QtGui.QPalette.Dark, QtGui.QColor(_MENU_BORDER))
+    return palette
+
+
+# Icon name -> QIcon. Icons are read from the Qt resource system
+# (":/icons/<name>.png", registered by a compiled resource module) so
+# showing a menu never touches the filesystem; null icons are cached too
+_MENU_ICONS = {}
+
+
+def _get_menu_icon(icon_name):
+    """Get cached menu icon by name"""
+    icon = _MENU_ICONS.get(icon_name)
+    if icon is None:
+        icon = QtGui.QIcon(f":/icons/{icon_name}.png")
+        _MENU_ICONS[icon_name] = icon
+    return icon
+
+
+# Standard key -> native shortcut text. Resolved on first use rather than
+# at import, since the platform key bindings need a running application
+_SHORTCUT_TEXT = {}
+
+
+def _shortcut_text(standard_key):
+    """Get cached native text for a QKeySequence standard key"""
+    text = _SHORTCUT_TEXT.get(standard_key)
+    if text is None:
+        text = QtGui.QKeySequence(standard_key).toString(QtGui.QKeySequence.NativeText)
+        _SHORTCUT_TEXT[standard_key] = text
+    return text
+
+
+def _hinted(text, standard_key):
+    """Action text with a right-aligned shortcut hint"""
+    hint = _shortcut_text(standard_key)
+    return f"{text}\t{hint}" if hint else text
+
+
+# Selection size from which alignment suspends the scene's spatial index
+_BATCH_INDEX_MIN_ITEMS = 50
+
+# (text, tag) tables for actions dispatched through a QActionGroup;
+# None entries become separators
+_CREATE_BUTTON_ACTIONS = (
+    ("Rectangle Button", 'rectangle'),
+    ("Round Rectangle Button", 'round_rectangle'),
+    ("Circle Button", 'circle'),
+    ("Polygon Button", 'polygon')
+)
+_CREATE_CONTROL_ACTIONS = (
+    ("Checkbox", 'checkbox'),
+    ("Slider", 'slider'),
+    ("Radius Button", 'radius_button'),
+    ("Pose Button", 'pose_button')
+)
+_ALIGN_ACTIONS = (
+    ("Align Left", 'left'),
+    ("Align Right", 'right'),
+    ("Align Center", 'center'),
+    None,
+    ("Align Top", 'top'),
+    ("Align Bottom", 'bottom'),
+    ("Align Middle", 'middle')
+)
+
+# Alignment tag -> AlignmentTools function
+_ALIGN_FUNCTIONS = {
+    'left': AlignmentTools.align_left,
+    'right': AlignmentTools.align_right,
+    'center': AlignmentTools.align_center_horizontal,
+    'top': AlignmentTools.align_top,
+    'bottom': AlignmentTools.align_bottom,
+    'middle': AlignmentTools.align_middle_vertical
+}
+
+
+def _add_tagged_actions(menu, entries, group):
+    """Add (text, tag) actions to menu and register them with group"""
+    for entry in entries:
+        if entry is None:
+            menu.addSeparator()
+            continue
+        text, tag = entry
+        action = menu.addAction(text)
+        action.setData(tag)
+        group.addAction(action)
+
+
+def _run_item_command(item, canvas):
+    """Execute an item command, reporting failures in a warning dialog"""
+    try:
+        item.execute_command()
+    except Exception as e:
+        QtWidgets.QMessageBox.warning(
+            canvas,
+            "Command Error",
+            f"Error executing command:\n{str(e)}"
+        )
+
+
+def _add_submenu(menu, title):
+    """Add a submenu using the picker menu style, which is not inherited"""
+    submenu = menu.addMenu(title)
+    submenu.setStyle(_menu_style())
+    return submenu
+
+
+def _item_caps(item):
+    """Get item capability flags, probing items that do not declare CAPS"""
+    caps = getattr(item, 'CAPS', None)
+    if caps is None:
+        caps = 0
+        if hasattr(item, 'text'):
+            caps |= CAP_TEXT
+        if hasattr(item, 'execute_command'):
+            caps |= CAP_COMMAND
+        if hasattr(item, 'store_current_pose'):
+            caps |= CAP_POSE
+        if hasattr(item, 'setZValue'):
+            caps |= CAP_ZORDER
+    return caps
+
 
 class BaseContextMenu(QtWidgets.QMenu):
     """Base context menu with common functionality"""
     
     def __init__(self, parent=None):
         super(BaseContextMenu, self).__init__(parent)
+        self.setObjectName(MENU_OBJECT_NAME)
         self.setup_style()
         
     def setup_style(self):
         """Setup menu style"""
-        self.setStyleSheet("""
-            QMenu {
-                background-color: #3E3E3E;
-                color: #FFFFFF;
-                border: 1px solid #666666;
-                padding: 4px;
-            }
-            QMenu::item {
-                padding: 6px 20px;
-                border-radius: 4px;
-            }
-            QMenu::item:selected {
-                background-color: #4A90E2;
-            }
-            QMenu::item:disabled {
-                color: #888888;
-            }
-            QMenu::separator {
-                height: 1px;
-                background-color: #666666;
-                margin: 4px 0px;
-            }
-        """)
-        
+        # Submenus inherit the palette; the style is set on each menu
+        self.setStyle(_menu_style())
+        self.setPalette(_menu_palette())
+                
     def add_action_with_icon(self, text, icon_name=None, shortcut=None):
-        """Add action with optional icon and shortcut"""
-        action = self.addAction(text)
-        
+        """Add action with optional icon and shortcut hint"""
         if shortcut:
-            action.setShortcut(shortcut)
+            # Shown as text only; a transient menu cannot fire shortcuts
+            hint = QtGui.QKeySequence(shortcut).toString(QtGui.QKeySequence.NativeText)
+            if hint:
+                text = f"{text}\t{hint}"
+        action = self.addAction(text)
             
         if icon_name:
-            # You could load icons from resources here
-            pass
+            icon = _get_menu_icon(icon_name)
+            if not icon.isNull():
+                action.setIcon(icon)
             
         return action
 
@@ -60,85 +236,97 @@ class CanvasContextMenu(BaseContextMenu):
     
     def __init__(self, canvas, scene_pos, global_pos, parent=None):
         super(CanvasContextMenu, self).__init__(parent)
+        # global_pos is only where the menu opens; it is not kept, so a
+        # reused menu holds no stale screen position
         self.canvas = canvas
         self.scene_pos = scene_pos
-        self.global_pos = global_pos
+        self._grid_action = None
+        self._snap_action = None
         self.setup_menu()
-        
+        self.aboutToShow.connect(self.refresh)
+        
+    def refresh(self, scene_pos=None):
+        """Update position and state-dependent actions before showing"""
+        if scene_pos is not None:
+            self.scene_pos = scene_pos
+        self._paste_action.setVisible(get_clipboard_manager().has_items())
+        if self._grid_action is not None:
+            self._grid_action.setChecked(self.canvas.is_grid_visible())
+            self._snap_action.setChecked(self.canvas.is_snap_to_grid())
+            
     def setup_menu(self):
         """Setup canvas context menu"""
-        # Create items submenu
-        create_menu = self.addMenu("Create")
+        # Submenus are filled on first show, most right-clicks never open them
+        create_menu = _add_submenu(self, "Create")
+        create_menu.aboutToShow.connect(partial(self._populate_create, create_menu))
         
-        # Button types
-        buttons_menu = create_menu.addMenu("Buttons")
+        self.addSeparator()
         
-        rect_action = buttons_menu.addAction("Rectangle Button")
-        rect_action.triggered.connect(lambda: self.create_item('rectangle'))
+        # Paste, shown by refresh() when the clipboard has items. Keys are
+        # handled by the canvas, menu actions only display the hint
+        self._paste_action = self.addAction(_hinted("Paste", QtGui.QKeySequence.Paste))
+        self._paste_action.triggered.connect(self.paste_items)
         
-        round_rect_action = buttons_menu.addAction("Round Rectangle Button")
-        round_rect_action.triggered.connect(lambda: self.create_item('round_rectangle'))
+        # Select All
+        select_all_action = self.addAction(_hinted("Select All", QtGui.QKeySequence.SelectAll))
+        select_all_action.triggered.connect(self.canvas.select_all)
         
-        circle_action = buttons_menu.addAction("Circle Button")
-        circle_action.triggered.connect(lambda: self.create_item('circle'))
+        self.addSeparator()
         
-        polygon_action = buttons_menu.addAction("Polygon Button")
-        polygon_action.triggered.connect(lambda: self.create_item('polygon'))
+        # View options
+        view_menu = _add_submenu(self, "View")
+        view_menu.aboutToShow.connect(partial(self._populate_view, view_menu))
         
-        create_menu.addSeparator()
+        self.addSeparator()
         
-        # Controls
-        controls_menu = create_menu.addMenu("Controls")
+        # Canvas properties
+        properties_action = self.addAction("Canvas Properties...")
+        properties_action.triggered.connect(self.show_canvas_properties)
         
-        checkbox_action = controls_menu.addAction("Checkbox")
-        checkbox_action.triggered.connect(lambda: self.create_item('checkbox'))
+    def _populate_create(self, create_menu):
+        """Fill the Create submenu"""
+        if not create_menu.isEmpty():
+            return
+            
+        # One group dispatches every create action by its data() tag
+        group = QtWidgets.QActionGroup(create_menu)
+        group.setExclusive(False)
+        group.triggered.connect(self._on_create_triggered)
         
-        slider_action = controls_menu.addAction("Slider")
-        slider_action.triggered.connect(lambda: self.create_item('slider'))
+        # Button types
+        buttons_menu = _add_submenu(create_menu, "Buttons")
+        _add_tagged_actions(buttons_menu, _CREATE_BUTTON_ACTIONS, group)
         
-        radius_action = controls_menu.addAction("Radius Button")
-        radius_action.triggered.connect(lambda: self.create_item('radius_button'))
+        create_menu.addSeparator()
         
-        pose_action = controls_menu.addAction("Pose Button")
-        pose_action.triggered.connect(lambda: self.create_item('pose_button'))
+        # Controls
+        controls_menu = _add_submenu(create_menu, "Controls")
+        _add_tagged_actions(controls_menu, _CREATE_CONTROL_ACTIONS, group)
         
         create_menu.addSeparator()
         
         # Text
-        text_action = create_menu.addAction("Text")
-        text_action.triggered.connect(lambda: self.create_item('text'))
-        
-        self.addSeparator()
+        _add_tagged_actions(create_menu, (("Text", 'text'),), group)
         
-        # Paste if available
-        from ..utils.clipboard_manager import get_clipboard_manager
-        clipboard_manager = get_clipboard_manager()
+    def _on_create_triggered(self, action):
+        """Create the item type tagged on the triggered action"""
+        self.create_item(action.data())
         
-        if clipboard_manager.has_items():
-            paste_action = self.addAction("Paste")
-            paste_action.setShortcut(QtGui.QKeySequence.Paste)
-            paste_action.triggered.connect(self.paste_items)
+    def _populate_view(self, view_menu):
+        """Fill the View submenu"""
+        if not view_menu.isEmpty():
+            return
             
-        # Select All
-        select_all_action = self.addAction("Select All")
-        select_all_action.setShortcut(QtGui.QKeySequence.SelectAll)
-        select_all_action.triggered.connect(self.canvas.select_all)
-        
-        self.addSeparator()
-        
-        # View options
-        view_menu = self.addMenu("View")
-        
         # Grid options
-        grid_action = view_menu.addAction("Toggle Grid")
-        grid_action.setCheckable(True)
-        grid_action.setChecked(self.canvas.is_grid_visible())
-        grid_action.triggered.connect(self.toggle_grid)
+        self._grid_action = view_menu.addAction("Toggle Grid")
+        self._grid_action.setCheckable(True)
+        self._grid_action.setChecked(self.canvas.is_grid_visible())
+        self._grid_action.triggered.connect(self.toggle_grid)
         
-        snap_action = view_menu.addAction("Snap to Grid")
-        snap_action.setCheckable(True)
-        snap_action.setChecked(self.canvas.is_snap_to_grid())
-        snap_action.triggered.connect(self.toggle_snap_to_grid)
+        self._snap_action = view_menu.addAction("Snap to Grid")
+        self._snap_action.setCheckable(True)
+        self._snap_action.setChecked(self.canvas.is_snap_to_grid())
+        self._snap_action.triggered.connect(self.toggle_snap_to_grid)
         
         view_menu.addSeparator()
         
@@ -152,12 +340,6 @@ class CanvasContextMenu(BaseContextMenu):
         reset_view_action = view_menu.addAction("Reset View")
         reset_view_action.triggered.connect(self.canvas.reset_view)
         
-        self.addSeparator()
-        
-        # Canvas properties
-        properties_action = self.addAction("Canvas Properties...")
-        properties_action.triggered.connect(self.show_canvas_properties)
-        
     def create_item(self, item_type):
         """Create new item at context menu position"""
         self.canvas.create_item(item_type, self.scene_pos)
@@ -187,66 +369,36 @@ class ItemContextMenu(BaseContextMenu):
         super(ItemContextMenu, self).__init__(parent)
         self.item = item
         self.canvas = canvas
-        self.global_pos = global_pos
+        self._caps = _item_caps(item)
         self.setup_menu()
         
     def setup_menu(self):
         """Setup item context menu"""
         # Item-specific actions
-        if hasattr(self.item, 'text'):
+        caps = self._caps
+        if caps & CAP_TEXT:
             edit_text_action = self.addAction("Edit Text...")
             edit_text_action.triggered.connect(self.edit_item_text)
             
-        if hasattr(self.item, 'execute_command'):
+        if caps & CAP_COMMAND:
             test_command_action = self.addAction("Test Command")
             test_command_action.triggered.connect(self.test_item_command)
             
-        if hasattr(self.item, 'store_current_pose'):
+        if caps & CAP_POSE:
             store_pose_action = self.addAction("Store Current Pose")
             store_pose_action.triggered.connect(self.store_current_pose)
             
         self.addSeparator()
         
-        # Transform actions
-        transform_menu = self.addMenu("Transform")
-        
-        # Alignment options
-        align_menu = transform_menu.addMenu("Align")
-        
-        align_left_action = align_menu.addAction("Align Left")
-        align_left_action.triggered.connect(lambda: self.align_items('left'))
-        
-        align_right_action = align_menu.addAction("Align Right")
-        align_right_action.triggered.connect(lambda: self.align_items('right'))
-        
-        align_center_action = align_menu.addAction("Align Center")
-        align_center_action.triggered.connect(lambda: self.align_items('center'))
-        
-        align_menu.addSeparator()
-        
-        align_top_action = align_menu.addAction("Align Top")
-        align_top_action.triggered.connect(lambda: self.align_items('top'))
-        
-        align_bottom_action = align_menu.addAction("Align Bottom")
-        align_bottom_action.triggered.connect(lambda: self.align_items('bottom'))
-        
-        align_middle_action = align_menu.addAction("Align Middle")
-        align_middle_action.triggered.connect(lambda: self.align_items('middle'))
-        
-        # Arrange options
-        arrange_menu = transform_menu.addMenu("Arrange")
-        
-        bring_front_action = arrange_menu.addAction("Bring to Front")
-        bring_front_action.triggered.connect(self.bring_to_front)
-        
-        send_back_action = arrange_menu.addAction("Send to Back")
-        send_back_action.triggered.connect(self.send_to_back)
+        # Transform actions, filled on first show
+        transform_menu = _add_submenu(self, "Transform")
+        transform_menu.aboutToShow.connect(
+            partial(self._populate_transform, transform_menu))
         
         self.addSeparator()
         
         # Edit actions
-        copy_action = self.addAction("Copy")
-        copy_action.setShortcut(QtGui.QKeySequence.Copy)
+        copy_action = self.addAction(_hinted("Copy", QtGui.QKeySequence.Copy))
         copy_action.triggered.connect(self.copy_item)
         
         # Copy style
@@ -254,7 +406,6 @@ class ItemContextMenu(BaseContextMenu):
         copy_style_action.triggered.connect(self.copy_item_style)
         
         # Paste style if available
-        from ..utils.clipboard_manager import get_clipboard_manager
         clipboard_manager = get_clipboard_manager()
         
         if clipboard_manager.has_style():
@@ -266,8 +417,7 @@ class ItemContextMenu(BaseContextMenu):
         
         self.addSeparator()
         
-        delete_action = self.addAction("Delete")
-        delete_action.setShortcut(QtGui.QKeySequence.Delete)
+        delete_action = self.addAction(_hinted("Delete", QtGui.QKeySequence.Delete))
         delete_action.triggered.connect(self.delete_item)
         
         self.addSeparator()
@@ -276,11 +426,37 @@ class ItemContextMenu(BaseContextMenu):
         properties_action = self.addAction("Properties...")
         properties_action.triggered.connect(self.show_item_properties)
         
+    def _populate_transform(self, transform_menu):
+        """Fill the Transform submenu"""
+        if not transform_menu.isEmpty():
+            return
+            
+        # Alignment options
+        align_menu = _add_submenu(transform_menu, "Align")
+        
+        align_group = QtWidgets.QActionGroup(align_menu)
+        align_group.setExclusive(False)
+        align_group.triggered.connect(self._on_align_triggered)
+        _add_tagged_actions(align_menu, _ALIGN_ACTIONS, align_group)
+        
+        # Arrange options
+        arrange_menu = _add_submenu(transform_menu, "Arrange")
+        
+        bring_front_action = arrange_menu.addAction("Bring to Front")
+        bring_front_action.triggered.connect(self.bring_to_front)
+        
+        send_back_action = arrange_menu.addAction("Send to Back")
+        send_back_action.triggered.connect(self.send_to_back)
+        
+    def _on_align_triggered(self, action):
+        """Align using the alignment tagged on the triggered action"""
+        self.align_items(action.data())
+        
     def edit_item_text(self):
         """Edit item text"""
         if hasattr(self.item, 'show_text_edit_dialog'):
             self.item.show_text_edit_dialog()
-        elif hasattr(self.item, 'text'):
+        elif self._caps & CAP_TEXT:
             text, ok = QtWidgets.QInputDialog.getText(
                 self.canvas,
                 "Edit Text",
@@ -295,19 +471,15 @@ class ItemContextMenu(BaseContextMenu):
                     
     def test_item_command(self):
         """Test item command"""
-        if hasattr(self.item, 'execute_command'):
-            try:
-                self.item.execute_command()
-            except Exception as e:
-                QtWidgets.QMessageBox.warning(
-                    self.canvas,
-                    "Command Error",
-                    f"Error executing command:\n{str(e)}"
-                )
+        if self._caps & CAP_COMMAND:
+            # Run once Maya is idle so the menu closes and the picker
+            # repaints before a slow command starts; the menu itself may be
+            # gone by then, so only the item and canvas are captured
+            mu.executeDeferred(partial(_run_item_command, self.item, self.canvas))
                 
     def store_current_pose(self):
         """Store current pose for pose buttons"""
-        if hasattr(self.item, 'store_current_pose'):
+        if self._caps & CAP_POSE:
             self.item.store_current_pose()
             
     def align_items(self, alignment):
@@ -316,50 +488,41 @@ class ItemContextMenu(BaseContextMenu):
         if len(selected_items) < 2:
             return
             
-        from ..core.alignment_tools import AlignmentTools
-        
-        if alignment == 'left':
-            AlignmentTools.align_left(selected_items)
-        elif alignment == 'right':
-            AlignmentTools.align_right(selected_items)
-        elif alignment == 'center':
-            AlignmentTools.align_center_horizontal(selected_items)
-        elif alignment == 'top':
-            AlignmentTools.align_top(selected_items)
-        elif alignment == 'bottom':
-            AlignmentTools.align_bottom(selected_items)
-        elif alignment == 'middle':
-            AlignmentTools.align_middle_vertical(selected_items)
+        align = _ALIGN_FUNCTIONS.get(alignment)
+        if align is None:
+            return
+            
+        # For large selections, move items without per-move BSP updates and
+        # rebuild the scene index once afterwards
+        scene = self.canvas.scene()
+        batch = scene is not None and len(selected_items) >= _BATCH_INDEX_MIN_ITEMS
+        if batch:
+            index_method = scene.itemIndexMethod()
+            scene.setItemIndexMethod(QtWidgets.QGraphicsScene.NoIndex)
+            
+        try:
+            align(selected_items)
+        finally:
+            if batch:
+                scene.setItemIndexMethod(index_method)
             
     def bring_to_front(self):
         """Bring item to front"""
-        max_z = -1
-        for item in self.canvas.get_all_items():
-            if hasattr(item, 'zValue'):
-                max_z = max(max_z, item.zValue())
-                
-        if hasattr(self.item, 'setZValue'):
-            self.item.setZValue(max_z + 1)
+        if self._caps & CAP_ZORDER:
+            self.canvas.set_item_z_value(self.item, self.canvas.z_top() + 1)
             
     def send_to_back(self):
         """Send item to back"""
-        min_z = 1
-        for item in self.canvas.get_all_items():
-            if hasattr(item, 'zValue'):
-                min_z = min(min_z, item.zValue())
-                
-        if hasattr(self.item, 'setZValue'):
-            self.item.setZValue(min_z - 1)
+        if self._caps & CAP_ZORDER:
+            self.canvas.set_item_z_value(self.item, self.canvas.z_bottom() - 1)
             
     def copy_item(self):
         """Copy item to clipboard"""
-        from ..utils.clipboard_manager import get_clipboard_manager
         clipboard_manager = get_clipboard_manager()
         clipboard_manager.copy_items([self.item])
         
     def copy_item_style(self):
         """Copy item style to clipboard"""
-        from ..utils.clipboard_manager import get_clipboard_manager
         clipboard_manager = get_clipboard_manager()
         clipboard_manager.copy_style(self.item)
         
@@ -367,13 +530,11 @@ class ItemContextMenu(BaseContextMenu):
         """Paste style to selected items"""
         selected_items = self.canvas.get_selected_items()
         if selected_items:
-            from ..utils.clipboard_manager import get_clipboard_manager
             clipboard_manager = get_clipboard_manager()
             clipboard_manager.paste_style(selected_items)
             
     def duplicate_item(self):
         """Duplicate item"""
-        from ..utils.clipboard_manager import get_clipboard_manager
         clipboard_manager = get_clipboard_manager()
         
         # Copy and paste the item
@@ -384,8 +545,7 @@ class ItemContextMenu(BaseContextMenu):
         new_items = clipboard_manager.paste_items(offset_pos, self.canvas)
         
         # Add to canvas
-        for item in new_items:
-            self.canvas.add_item(item)
+        self.canvas.add_items(new_items)
             
     def delete_item(self):
         """Delete item"""
@@ -415,19 +575,21 @@ class CanvasPropertiesDialog(QtWidgets.QDialog):
         self.setup_ui()
         
     def setup_ui(self):
-        """Setup dialog UI"""
+        """Setup dialog UI; values are filled in when the dialog is shown"""
         layout = QtWidgets.QVBoxLayout(self)
         
         # Canvas info
         info_group = QtWidgets.QGroupBox("Canvas Information")
         info_layout = QtWidgets.QFormLayout(info_group)
         
-        canvas_info = self.canvas.get_canvas_info()
-        
-        info_layout.addRow("Total Items:", QtWidgets.QLabel(str(canvas_info['total_items'])))
-        info_layout.addRow("Selected Items:", QtWidgets.QLabel(str(canvas_info['selected_items'])))
-        info_layout.addRow("Zoom Factor:", QtWidgets.QLabel(f"{canvas_info['zoom_factor']:.1f}x"))
-        info_layout.addRow("Edit Mode:", QtWidgets.QLabel("Yes" if canvas_info['edit_mode'] else "No"))
+        self.total_items_label = QtWidgets.QLabel()
+        self.selected_items_label = QtWidgets.QLabel()
+        self.zoom_factor_label = QtWidgets.QLabel()
+        self.edit_mode_label = QtWidgets.QLabel()
+        info_layout.addRow("Total Items:", self.total_items_label)
+        info_layout.addRow("Selected Items:", self.selected_items_label)
+        info_layout.addRow("Zoom Factor:", self.zoom_factor_label)
+        info_layout.addRow("Edit Mode:", self.edit_mode_label)
         
         layout.addWidget(info_group)
         
@@ -437,18 +599,15 @@ class CanvasPropertiesDialog(QtWidgets.QDialog):
         
         # Grid visible
         self.grid_visible_check = QtWidgets.QCheckBox()
-        self.grid_visible_check.setChecked(canvas_info['grid_visible'])
         grid_layout.addRow("Show Grid:", self.grid_visible_check)
         
         # Grid size
         self.grid_size_spin = QtWidgets.QSpinBox()
         self.grid_size_spin.setRange(5, 100)
-        self.grid_size_spin.setValue(canvas_info['grid_size'])
         grid_layout.addRow("Grid Size:", self.grid_size_spin)
         
         # Snap to grid
         self.snap_to_grid_check = QtWidgets.QCheckBox()
-        self.snap_to_grid_check.setChecked(canvas_info['snap_to_grid'])
         grid_layout.addRow("Snap to Grid:", self.snap_to_grid_check)
         
         layout.addWidget(grid_group)
@@ -484,6 +643,21 @@ class CanvasPropertiesDialog(QtWidgets.QDialog):
         
         layout.addWidget(button_box)
         
+    def showEvent(self, event):
+        """Fill in current canvas values when shown"""
+        self.populate(self.canvas.get_canvas_info())
+        super(CanvasPropertiesDialog, self).showEvent(event)
+        
+    def populate(self, canvas_info):
+        """Fill widgets from canvas info"""
+        self.total_items_label.setText(str(canvas_info['total_items']))
+        self.selected_items_label.setText(str(canvas_info['selected_items']))
+        self.zoom_factor_label.setText(f"{canvas_info['zoom_factor']:.1f}x")
+        self.edit_mode_label.setText("Yes" if canvas_info['edit_mode'] else "No")
+        self.grid_visible_check.setChecked(canvas_info['grid_visible'])
+        self.grid_size_spin.setValue(canvas_info['grid_size'])
+        self.snap_to_grid_check.setChecked(canvas_info['snap_to_grid'])
+        
     def choose_background_color(self):
         """Choose background color"""
         current_color = self.canvas.backgroundBrush().color()
@@ -587,6 +761,15 @@ class TabContextMenu(BaseContextMenu):
         self.tab_widget = tab_widget
         self.tab_index = tab_index
         self.setup_menu()
+        self.refresh(tab_index)
+        
+    def refresh(self, tab_index):
+        """Retarget the menu at a tab before showing it again"""
+        self.tab_index = tab_index
+        
+        # Disable delete if it's the last tab
+        if hasattr(self.tab_widget, 'count'):
+            self._delete_action.setEnabled(self.tab_widget.count() > 1)
         
     def setup_menu(self):
         """Setup tab context menu"""
@@ -600,13 +783,9 @@ class TabContextMenu(BaseContextMenu):
         
         self.addSeparator()
         
-        # Delete tab
-        delete_action = self.addAction("Delete")
-        delete_action.triggered.connect(self.delete_tab)
-        
-        # Disable delete if it's the last tab
-        if hasattr(self.tab_widget, 'count') and self.tab_widget.count() <= 1:
-            delete_action.setEnabled(False)
+        # Delete tab, enabled state set by refresh()
+        self._delete_action = self.addAction("Delete")
+        self._delete_action.triggered.connect(self.delete_tab)
             
     def rename_tab(self):
         """Rename tab"""
@@ -628,7 +807,14 @@ def show_context_menu(widget, position, menu_type='default', **kwargs):
     elif menu_type == 'item':
         menu = ItemContextMenu(kwargs.get('item'), kwargs.get('canvas'), position)
     elif menu_type == 'tab':
-        menu = TabContextMenu(kwargs.get('tab_widget'), kwargs.get('tab_index'))
+        # One menu per tab widget, retargeted on each right-click
+        tab_widget = kwargs.get('tab_widget')
+        menu = getattr(tab_widget, '_tab_context_menu', None)
+        if menu is None:
+            menu = TabContextMenu(tab_widget, kwargs.get('tab_index'), tab_widget)
+            tab_widget._tab_context_menu = menu
+        else:
+            menu.refresh(kwargs.get('tab_index'))
     else:
         menu = BaseContextMenu()
         
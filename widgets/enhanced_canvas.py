@@ -4,13 +4,47 @@ Enhanced Canvas Widget for Ultimate Animation Picker
 Provides unlimited work area with advanced navigation, selection, and item management
 """
 
+import importlib
+import json
 import math
+import os
 from PySide2 import QtWidgets, QtCore, QtGui
 from PySide2.QtCore import Signal
 from ..core.rubber_band import SelectionManager
 from ..utils.coordinate_system import ViewportManager, GridSystem
 from ..utils.clipboard_manager import get_clipboard_manager
 
+# File extensions accepted when files are dropped on the canvas
+_DROP_EXTENSIONS = frozenset(('.json',))
+
+# Item type -> (module relative to this package, class name, button shape)
+_ITEM_TYPES = {
+    'rectangle': ('..items.rectangle', 'RectangleItem', None),
+    'round_rectangle': ('..items.button', 'ButtonItem', 'round_rectangle'),
+    'circle': ('..items.button', 'ButtonItem', 'circle'),
+    'polygon': ('..items.polygon', 'PolygonItem', None),
+    'checkbox': ('..items.checkbox', 'CheckboxItem', None),
+    'slider': ('..items.slider', 'SliderItem', None),
+    'radius_button': ('..items.radius_button', 'RadiusButtonItem', None),
+    'pose_button': ('..items.pose_button', 'PoseButtonItem', None),
+    'text': ('..items.text_item', 'TextItem', None)
+}
+
+# Item type -> item class, imported on first use
+_ITEM_CLASSES = {}
+
+
+def _get_item_class(item_type):
+    """Get the item class for a type, importing its module once"""
+    cls = _ITEM_CLASSES.get(item_type)
+    if cls is None:
+        module_name, class_name, _ = _ITEM_TYPES[item_type]
+        module = importlib.import_module(module_name, __package__)
+        cls = getattr(module, class_name)
+        _ITEM_CLASSES[item_type] = cls
+    return cls
+
+
 class EnhancedCanvas(QtWidgets.QGraphicsView):
     """Enhanced canvas with unlimited work area and advanced features"""
     
@@ -34,12 +68,52 @@ class EnhancedCanvas(QtWidgets.QGraphicsView):
         self._grid_visible = False
         self._snap_to_grid = False
         self._high_quality_rendering = True
+        self._quality_reduced = False  # Antialiasing paused while navigating
+        
+        # Z range of items, kept up to date as items are added and reordered
+        self._z_top = -1.0
+        self._z_bottom = 1.0
+        
+        # Picker items added through the canvas, in insertion order. A dict
+        # gives constant-time membership and removal; proxy widgets are
+        # not tracked since they are not picker items
+        self._items = {}
+        
+        # Items that respond to set_edit_mode, found once when added so
+        # edit mode toggles only visit them
+        self._edit_aware_items = {}
+        
+        # Canvas context menu, built on first right-click and reused
+        self._ctx_canvas_menu = None
+        
+        # Answer area queries from the scene's BSP index; turned off if the
+        # index query fails, falling back to a linear scan
+        self._use_spatial_index = True
         
         # Navigation state
         self._is_panning = False
         self._is_rubber_band_selecting = False
+        self._ctrl_toggle = None  # (item, selected) set by a Ctrl+click
         self._last_pan_point = QtCore.QPointF()
         self._zoom_factor = 1.0
+        self._last_emitted_zoom = None
+        self._last_emitted_pan = None
+        
+        # Wheel input accumulated between flushes of the wheel timer
+        self._pending_pan_dx = 0.0
+        self._pending_pan_dy = 0.0
+        self._pending_zoom_steps = 0
+        self._pending_zoom_center = None
+        
+        # View transform as last set from the viewport manager, so hit tests
+        # do not recompose it on every mouse event
+        self._cached_transform = QtGui.QTransform()
+        
+        # Viewport geometry, refreshed on resize; the scene-space center
+        # also follows pan/zoom
+        self._viewport_rect = QtCore.QRectF()
+        self._viewport_center = QtCore.QPoint()
+        self._viewport_scene_center = QtCore.QPointF()
         self._min_zoom = 0.1
         self._max_zoom = 10.0
         
@@ -48,6 +122,7 @@ class EnhancedCanvas(QtWidgets.QGraphicsView):
         self.setup_scene()
         self.setup_managers()
         self.setup_interactions()
+        self._update_viewport_geometry()
         
     def setup_canvas(self):
         """Setup canvas properties"""
@@ -74,7 +149,13 @@ class EnhancedCanvas(QtWidgets.QGraphicsView):
         self.setTransformationAnchor(QtWidgets.QGraphicsView.AnchorUnderMouse)
         
         # Background
-        self.setBackgroundBrush(QtGui.QBrush(QtGui.QColor(45, 45, 45)))
+        self._bg_brush = QtGui.QBrush(QtGui.QColor(45, 45, 45))
+        self.setBackgroundBrush(self._bg_brush)
+        
+        # Grid pen, built once; cosmetic so it stays one pixel wide at any
+        # zoom without Qt scaling the stroke
+        self._grid_pen = QtGui.QPen(QtGui.QColor(68, 68, 68, 128), 1, QtCore.Qt.DotLine)  # Semi-transparent gray
+        self._grid_pen.setCosmetic(True)
         
         # Frame style
         self.setFrameStyle(QtWidgets.QFrame.NoFrame)
@@ -82,6 +163,8 @@ class EnhancedCanvas(QtWidgets.QGraphicsView):
     def setup_scene(self):
         """Setup graphics scene"""
         self._scene = QtWidgets.QGraphicsScene(self)
+        self._scene.setItemIndexMethod(QtWidgets.QGraphicsScene.BspTreeIndex)
+        self._scene.setBspTreeDepth(0)  # 0 lets Qt size the tree to the item count
         
         # Set unlimited scene size
         scene_size = 1000000  # Very large scene
@@ -120,6 +203,37 @@ class EnhancedCanvas(QtWidgets.QGraphicsView):
         self.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
         self.customContextMenuRequested.connect(self._show_context_menu)
         
+        # Applies accumulated wheel pan/zoom at most once per frame, however
+        # fast the device reports wheel events
+        self._wheel_flush_timer = QtCore.QTimer(self)
+        self._wheel_flush_timer.setSingleShot(True)
+        self._wheel_flush_timer.setInterval(16)
+        self._wheel_flush_timer.timeout.connect(self._flush_wheel)
+        
+        # Restores antialiasing once pan/zoom input has been idle briefly
+        self._quality_restore_timer = QtCore.QTimer(self)
+        self._quality_restore_timer.setSingleShot(True)
+        self._quality_restore_timer.setInterval(100)
+        self._quality_restore_timer.timeout.connect(self._restore_render_quality)
+        
+        # Keyboard shortcuts: int key code -> (needs Ctrl, handler)
+        self._shortcut_table = {
+            # Selection shortcuts
+            int(QtCore.Qt.Key_A): (True, self.select_all),
+            # Copy/Paste shortcuts
+            int(QtCore.Qt.Key_C): (True, self.copy_selected),
+            int(QtCore.Qt.Key_V): (True, self._paste_at_cursor),
+            # Delete shortcut
+            int(QtCore.Qt.Key_Delete): (False, self.delete_selected),
+            # Navigation shortcuts
+            int(QtCore.Qt.Key_F): (False, self.zoom_fit),
+            int(QtCore.Qt.Key_Home): (False, self.reset_view),
+            # Zoom shortcuts
+            int(QtCore.Qt.Key_Plus): (True, self.zoom_in),
+            int(QtCore.Qt.Key_Minus): (True, self.zoom_out),
+            int(QtCore.Qt.Key_0): (True, self.reset_zoom)
+        }
+        
     def set_edit_mode(self, edit_mode):
         """Set edit mode state"""
         if self._edit_mode != edit_mode:
@@ -131,10 +245,9 @@ class EnhancedCanvas(QtWidgets.QGraphicsView):
             else:
                 self.setCursor(QtCore.Qt.PointingHandCursor)
                 
-            # Update scene items
-            for item in self._scene.items():
-                if hasattr(item, 'set_edit_mode'):
-                    item.set_edit_mode(edit_mode)
+            # Update edit-aware items
+            for item in self._edit_aware_items:
+                item.set_edit_mode(edit_mode)
                     
             self.edit_mode_changed.emit(edit_mode)
             
@@ -147,8 +260,21 @@ class EnhancedCanvas(QtWidgets.QGraphicsView):
         if self._grid_visible != visible:
             self._grid_visible = visible
             self.grid_system.set_visible(visible)
+            self._apply_grid_update_mode()
             self.viewport().update()
             
+    def _apply_grid_update_mode(self):
+        """Pick viewport update and cache modes for the grid state"""
+        # With the grid on, every pan or zoom repaints the whole viewport
+        # anyway, so skip Smart mode's region analysis; with it off, Smart
+        # mode repaints only what changed. The background is not cached:
+        # panning goes through setTransform, which would invalidate the
+        # cache on every tick
+        if self._grid_visible:
+            self.setViewportUpdateMode(QtWidgets.QGraphicsView.FullViewportUpdate)
+        else:
+            self.setViewportUpdateMode(QtWidgets.QGraphicsView.SmartViewportUpdate)
+            
     def is_grid_visible(self):
         """Check if grid is visible"""
         return self._grid_visible
@@ -184,33 +310,110 @@ class EnhancedCanvas(QtWidgets.QGraphicsView):
         if hasattr(item, 'set_edit_mode'):
             item.set_edit_mode(self._edit_mode)
             
-        # Add to scene
+        # Add to scene; selection is tracked natively by the scene
+        item.setFlag(QtWidgets.QGraphicsItem.ItemIsSelectable, True)
         self._scene.addItem(item)
+        self._track_item(item)
+        self._track_z_value(item.zValue())
         
         # Connect item signals if available
         self._connect_item_signals(item)
         
         self.item_added.emit(item)
         
+    def add_items(self, items):
+        """Add several items to canvas as one scene batch"""
+        if not items:
+            return
+            
+        # Scene signals are held until the batch is in, so listeners see
+        # one change instead of one per item
+        scene = self._scene
+        blocked = scene.blockSignals(True)
+        try:
+            for item in items:
+                if hasattr(item, 'set_edit_mode'):
+                    item.set_edit_mode(self._edit_mode)
+                item.setFlag(QtWidgets.QGraphicsItem.ItemIsSelectable, True)
+                scene.addItem(item)
+                self._track_item(item)
+                self._track_z_value(item.zValue())
+                self._connect_item_signals(item)
+        finally:
+            scene.blockSignals(blocked)
+            
+        scene.update()
+        for item in items:
+            self.item_added.emit(item)
+            
     def remove_item(self, item):
         """Remove item from canvas"""
-        if item in self._scene.items():
-            self._scene.removeItem(item)
-            
-            # Remove from selection
-            if item in self.selection_manager.get_selected_items():
+        if item.scene() is self._scene:
+            # Remove from selection while the scene still owns the item
+            if item.isSelected():
                 self.selection_manager.deselect_item(item)
                 
+            self._scene.removeItem(item)
+            self._items.pop(item, None)
+            self._edit_aware_items.pop(item, None)
+                
             self.item_removed.emit(item)
             
+    def _track_item(self, item):
+        """Record an item in the item caches"""
+        if not isinstance(item, QtWidgets.QGraphicsProxyWidget):
+            self._items[item] = None
+        if hasattr(item, 'set_edit_mode'):
+            self._edit_aware_items[item] = None
+            
+    def z_top(self):
+        """Get highest z value in use (at least -1)"""
+        return self._z_top
+        
+    def z_bottom(self):
+        """Get lowest z value in use (at most 1)"""
+        return self._z_bottom
+        
+    def set_item_z_value(self, item, z):
+        """Set item z value and track the canvas z range"""
+        item.setZValue(z)
+        self._track_z_value(z)
+        
+    def _track_z_value(self, z):
+        """Widen the tracked z range to include z"""
+        if z > self._z_top:
+            self._z_top = z
+        if z < self._z_bottom:
+            self._z_bottom = z
+            
     def get_all_items(self):
         """Get all items on canvas"""
-        return [item for item in self._scene.items() 
-                if not isinstance(item, QtWidgets.QGraphicsProxyWidget)]
+        return list(self._items)
+                
+    def get_items_in_rect(self, rect, order=QtCore.Qt.DescendingOrder):
+        """Get items whose bounding rect intersects a scene rect
+        
+        ``order`` is the stacking order of the result when the spatial index
+        is used; paint overlays want AscendingOrder (bottom-most first).
+        """
+        rect = QtCore.QRectF(rect)
+        if self._use_spatial_index:
+            try:
+                items = self._scene.items(rect, QtCore.Qt.IntersectsItemBoundingRect, order)
+                # Membership in the item cache stands in for a per-item type
+                # check; it also leaves out proxies and child items
+                picker_items = self._items
+                return [item for item in items if item in picker_items]
+            except Exception as e:
+                print(f"Spatial index query failed, using linear scan: {e}")
+                self._use_spatial_index = False
+                
+        return [item for item in self.get_all_items()
+                if item.sceneBoundingRect().intersects(rect)]
                 
     def get_selected_items(self):
         """Get selected items"""
-        return self.selection_manager.get_selected_items()
+        return self._scene.selectedItems()
         
     def clear_selection(self):
         """Clear all selection"""
@@ -222,7 +425,11 @@ class EnhancedCanvas(QtWidgets.QGraphicsView):
         
     def delete_selected(self):
         """Delete selected items"""
+        # Snapshot, then clear the selection in one step so removals do not
+        # deselect and re-emit the selection one item at a time
         selected_items = self.get_selected_items()
+        if selected_items:
+            self.selection_manager.clear_selection()
         for item in selected_items:
             self.remove_item(item)
             
@@ -236,14 +443,12 @@ class EnhancedCanvas(QtWidgets.QGraphicsView):
         """Paste items from clipboard"""
         if position is None:
             # Use center of view
-            center = self.mapToScene(self.viewport().rect().center())
-            position = center
+            position = QtCore.QPointF(self._viewport_scene_center)
             
         pasted_items = self.clipboard_manager.paste_items(position, self)
         
         # Add pasted items to canvas
-        for item in pasted_items:
-            self.add_item(item)
+        self.add_items(pasted_items)
             
         # Select pasted items
         if pasted_items:
@@ -254,27 +459,23 @@ class EnhancedCanvas(QtWidgets.QGraphicsView):
         
     def zoom_in(self):
         """Zoom in"""
-        center = self.mapToScene(self.viewport().rect().center())
         self.viewport_manager.zoom_manager.zoom_in()
         
     def zoom_out(self):
         """Zoom out"""
-        center = self.mapToScene(self.viewport().rect().center())
         self.viewport_manager.zoom_manager.zoom_out()
         
     def zoom_fit(self):
         """Zoom to fit all items"""
         items = self.get_all_items()
         if items:
-            viewport_rect = QtCore.QRectF(self.viewport().rect())
-            self.viewport_manager.fit_items_in_view(items, viewport_rect)
+            self.viewport_manager.fit_items_in_view(items, self._viewport_rectf())
             
     def zoom_selection(self):
         """Zoom to fit selected items"""
         selected_items = self.get_selected_items()
         if selected_items:
-            viewport_rect = QtCore.QRectF(self.viewport().rect())
-            self.viewport_manager.fit_items_in_view(selected_items, viewport_rect)
+            self.viewport_manager.fit_items_in_view(selected_items, self._viewport_rectf())
             
     def reset_zoom(self):
         """Reset zoom to 100%"""
@@ -290,13 +491,28 @@ class EnhancedCanvas(QtWidgets.QGraphicsView):
         
     def pan_to_center(self, scene_point):
         """Pan to center point in view"""
-        viewport_center = self.viewport().rect().center()
-        self.viewport_manager.pan_manager.pan_to_center_point(scene_point, viewport_center)
+        self.viewport_manager.pan_manager.pan_to_center_point(scene_point, self._viewport_center)
         
     def reset_view(self):
         """Reset view to default"""
         self.viewport_manager.reset_view()
         
+    def _update_viewport_geometry(self):
+        """Refresh cached viewport rect and center"""
+        rect = self.viewport().rect()
+        self._viewport_rect = QtCore.QRectF(rect)
+        self._viewport_center = rect.center()
+        self._viewport_scene_center = self.mapToScene(self._viewport_center)
+        
+    def _viewport_rectf(self):
+        """Get cached viewport rect; shared, so callers must not modify it"""
+        return self._viewport_rect
+        
+    def resizeEvent(self, event):
+        """Handle resize"""
+        super(EnhancedCanvas, self).resizeEvent(event)
+        self._update_viewport_geometry()
+        
     def _connect_item_signals(self, item):
         """Connect item-specific signals"""
         # This would connect to item-specific signals if the item supports them
@@ -306,14 +522,20 @@ class EnhancedCanvas(QtWidgets.QGraphicsView):
         """Handle viewport transformation changes"""
         transform = self.viewport_manager.get_viewport_transform()
         self.setTransform(transform)
+        self._cached_transform = transform
+        self._viewport_scene_center = self.mapToScene(self._viewport_center)
         
         # Emit zoom change
         zoom_factor = self.viewport_manager.zoom_manager.get_zoom_factor()
-        self.zoom_changed.emit(zoom_factor)
+        if zoom_factor != self._last_emitted_zoom:
+            self._last_emitted_zoom = zoom_factor
+            self.zoom_changed.emit(zoom_factor)
         
         # Emit pan change
         pan_offset = self.viewport_manager.pan_manager.get_pan_offset()
-        self.pan_changed.emit(pan_offset)
+        if pan_offset != self._last_emitted_pan:
+            self._last_emitted_pan = QtCore.QPointF(pan_offset)
+            self.pan_changed.emit(pan_offset)
         
         # Update grid if visible
         if self._grid_visible:
@@ -322,7 +544,7 @@ class EnhancedCanvas(QtWidgets.QGraphicsView):
     def _show_context_menu(self, position):
         """Show context menu"""
         scene_pos = self.mapToScene(position)
-        item = self.itemAt(position)
+        item = self._item_at(scene_pos)
         
         # Import context menu
         from .context_menu import CanvasContextMenu
@@ -331,25 +553,56 @@ class EnhancedCanvas(QtWidgets.QGraphicsView):
             # Item-specific context menu
             item.show_context_menu(self.mapToGlobal(position))
         else:
-            # Canvas context menu
-            menu = CanvasContextMenu(self, scene_pos, self.mapToGlobal(position))
-            menu.exec_()
-            
+            # Canvas context menu, reused across right-clicks
+            global_pos = self.mapToGlobal(position)
+            menu = self._ctx_canvas_menu
+            if menu is None:
+                menu = CanvasContextMenu(self, scene_pos, global_pos, self)
+                self._ctx_canvas_menu = menu
+            else:
+                menu.refresh(scene_pos)
+            menu.exec_(global_pos)
+            
+    def is_navigating(self):
+        """Check if antialiasing is paused for navigation"""
+        return self._quality_reduced
+        
+    def _reduce_render_quality(self):
+        """Pause antialiasing while the view is being navigated"""
+        if self._high_quality_rendering and not self._quality_reduced:
+            self._quality_reduced = True
+            self.setRenderHint(QtGui.QPainter.Antialiasing, False)
+            self.setRenderHint(QtGui.QPainter.TextAntialiasing, False)
+            
+    def _restore_render_quality(self):
+        """Resume antialiasing after navigation"""
+        if self._quality_reduced:
+            self._quality_reduced = False
+            self.setRenderHint(QtGui.QPainter.Antialiasing, True)
+            self.setRenderHint(QtGui.QPainter.TextAntialiasing, True)
+            
+    def _item_at(self, scene_pos):
+        """Get the topmost item at a scene position"""
+        # Scene-coordinate lookup, so the view does not map the point again
+        return self._scene.itemAt(scene_pos, self._cached_transform)
+        
     # Event handlers
     def mousePressEvent(self, event):
         """Handle mouse press"""
-        scene_pos = self.mapToScene(event.pos())
+        pos = event.pos()
+        scene_pos = self.mapToScene(pos)
         
         if event.button() == QtCore.Qt.MiddleButton:
             # Start panning
             self._is_panning = True
-            self._last_pan_point = event.pos()
+            self._last_pan_point = pos
+            self._reduce_render_quality()
             self.setCursor(QtCore.Qt.ClosedHandCursor)
             event.accept()
             return
             
         elif event.button() == QtCore.Qt.LeftButton:
-            item = self.itemAt(event.pos())
+            item = self._item_at(scene_pos)
             
             if not item:
                 # Click on empty canvas
@@ -371,11 +624,15 @@ class EnhancedCanvas(QtWidgets.QGraphicsView):
                 modifiers = event.modifiers()
                 
                 if modifiers & QtCore.Qt.ControlModifier:
-                    # Toggle selection
+                    # Toggle selection here rather than relying on Qt's native
+                    # Ctrl toggle on release: SliderItem and RadiusButtonItem
+                    # drags accept the release without passing it on
                     self.selection_manager.toggle_item_selection(item)
+                    self._ctrl_toggle = (item, item.isSelected())
+                    event.accept()
                 else:
                     # Select item
-                    if item not in self.get_selected_items():
+                    if not item.isSelected():
                         self.selection_manager.select_item(item)
                         
         super(EnhancedCanvas, self).mousePressEvent(event)
@@ -384,11 +641,9 @@ class EnhancedCanvas(QtWidgets.QGraphicsView):
         """Handle mouse move"""
         if self._is_panning:
             # Pan the view
-            delta = event.pos() - self._last_pan_point
-            self.viewport_manager.pan_manager.update_pan(
-                self.mapToScene(event.pos())
-            )
-            self._last_pan_point = event.pos()
+            pos = event.pos()
+            self.viewport_manager.pan_manager.update_pan(self.mapToScene(pos))
+            self._last_pan_point = pos
             event.accept()
             return
             
@@ -407,6 +662,8 @@ class EnhancedCanvas(QtWidgets.QGraphicsView):
             # End panning
             self._is_panning = False
             self.viewport_manager.pan_manager.end_pan()
+            self._quality_restore_timer.stop()
+            self._restore_render_quality()
             self.setCursor(QtCore.Qt.ArrowCursor if self._edit_mode else QtCore.Qt.PointingHandCursor)
             event.accept()
             return
@@ -421,11 +678,19 @@ class EnhancedCanvas(QtWidgets.QGraphicsView):
             
         super(EnhancedCanvas, self).mouseReleaseEvent(event)
         
+        if event.button() == QtCore.Qt.LeftButton and self._ctrl_toggle is not None:
+            # Items whose release reaches QGraphicsItem toggle a second time;
+            # keep the state chosen on press
+            item, selected = self._ctrl_toggle
+            self._ctrl_toggle = None
+            if item.scene() is self._scene and item.isSelected() != selected:
+                item.setSelected(selected)
+        
     def mouseDoubleClickEvent(self, event):
         """Handle double click"""
         if event.button() == QtCore.Qt.LeftButton:
             scene_pos = self.mapToScene(event.pos())
-            item = self.itemAt(event.pos())
+            item = self._item_at(scene_pos)
             
             if not item:
                 self.canvas_double_clicked.emit(scene_pos)
@@ -434,81 +699,57 @@ class EnhancedCanvas(QtWidgets.QGraphicsView):
         
     def wheelEvent(self, event):
         """Handle mouse wheel for zooming"""
+        delta = event.angleDelta()
         if event.modifiers() & QtCore.Qt.ControlModifier:
-            # Zoom with Ctrl+Wheel
-            zoom_center = self.mapToScene(event.pos())
-            zoom_delta = event.angleDelta().y()
-            
-            self.viewport_manager.zoom_at_point(zoom_delta, zoom_center)
-            event.accept()
+            # Zoom with Ctrl+Wheel, one step per event as before
+            zoom_delta = delta.y()
+            if zoom_delta:
+                self._pending_zoom_steps += 1 if zoom_delta > 0 else -1
+                self._pending_zoom_center = self.mapToScene(event.pos())
         else:
-            # Pan with wheel
-            delta = event.angleDelta()
-            pan_delta = QtCore.QPointF(delta.x(), delta.y()) * 0.5
-            current_pan = self.viewport_manager.pan_manager.get_pan_offset()
-            new_pan = current_pan + pan_delta
-            self.viewport_manager.pan_manager.set_pan_offset(new_pan)
-            event.accept()
+            # Pan with wheel, accumulated as plain floats
+            self._pending_pan_dx += delta.x() * 0.5
+            self._pending_pan_dy += delta.y() * 0.5
+            
+        if not self._wheel_flush_timer.isActive():
+            self._wheel_flush_timer.start()
+            
+        # Restart the restore countdown on every wheel event
+        self._reduce_render_quality()
+        self._quality_restore_timer.start()
+        event.accept()
+        
+    def _flush_wheel(self):
+        """Apply wheel pan/zoom accumulated since the last flush"""
+        steps = self._pending_zoom_steps
+        if steps:
+            self._pending_zoom_steps = 0
+            self.viewport_manager.zoom_at_point(steps, self._pending_zoom_center, abs(steps))
+            
+        dx, dy = self._pending_pan_dx, self._pending_pan_dy
+        if dx or dy:
+            self._pending_pan_dx = self._pending_pan_dy = 0.0
+            pan_manager = self.viewport_manager.pan_manager
+            current_pan = pan_manager.get_pan_offset()
+            pan_manager.set_pan_offset_xy(current_pan.x() + dx, current_pan.y() + dy)
             
     def keyPressEvent(self, event):
         """Handle key press"""
-        key = event.key()
-        modifiers = event.modifiers()
-        
-        # Selection shortcuts
-        if key == QtCore.Qt.Key_A and modifiers & QtCore.Qt.ControlModifier:
-            self.select_all()
-            event.accept()
-            return
-            
-        # Copy/Paste shortcuts
-        elif key == QtCore.Qt.Key_C and modifiers & QtCore.Qt.ControlModifier:
-            self.copy_selected()
-            event.accept()
-            return
-            
-        elif key == QtCore.Qt.Key_V and modifiers & QtCore.Qt.ControlModifier:
-            cursor_pos = self.mapFromGlobal(QtGui.QCursor.pos())
-            scene_pos = self.mapToScene(cursor_pos)
-            self.paste_items(scene_pos)
-            event.accept()
-            return
-            
-        # Delete shortcut
-        elif key == QtCore.Qt.Key_Delete:
-            self.delete_selected()
-            event.accept()
-            return
-            
-        # Navigation shortcuts
-        elif key == QtCore.Qt.Key_F:
-            self.zoom_fit()
-            event.accept()
-            return
-            
-        elif key == QtCore.Qt.Key_Home:
-            self.reset_view()
-            event.accept()
-            return
-            
-        # Zoom shortcuts
-        elif key == QtCore.Qt.Key_Plus and modifiers & QtCore.Qt.ControlModifier:
-            self.zoom_in()
-            event.accept()
-            return
-            
-        elif key == QtCore.Qt.Key_Minus and modifiers & QtCore.Qt.ControlModifier:
-            self.zoom_out()
-            event.accept()
-            return
-            
-        elif key == QtCore.Qt.Key_0 and modifiers & QtCore.Qt.ControlModifier:
-            self.reset_zoom()
-            event.accept()
-            return
-            
+        entry = self._shortcut_table.get(int(event.key()))
+        if entry is not None:
+            needs_control, handler = entry
+            if not needs_control or event.modifiers() & QtCore.Qt.ControlModifier:
+                handler()
+                event.accept()
+                return
+                
         super(EnhancedCanvas, self).keyPressEvent(event)
         
+    def _paste_at_cursor(self):
+        """Paste clipboard items under the mouse cursor"""
+        cursor_pos = self.mapFromGlobal(QtGui.QCursor.pos())
+        self.paste_items(self.mapToScene(cursor_pos))
+        
     def dragEnterEvent(self, event):
         """Handle drag enter"""
         if event.mimeData().hasText() or event.mimeData().hasUrls():
@@ -530,119 +771,98 @@ class EnhancedCanvas(QtWidgets.QGraphicsView):
         if event.mimeData().hasText():
             # Handle text drop (could be JSON data for items)
             text = event.mimeData().text()
+            
+            # Item data is a JSON object or array; other text is turned away
+            # without attempting a parse
+            if text.lstrip()[:1] not in ('{', '['):
+                event.ignore()
+                return
+                
             try:
-                import json
                 data = json.loads(text)
                 # Handle item data drop
                 event.acceptProposedAction()
-            except:
+            except ValueError:
                 event.ignore()
         elif event.mimeData().hasUrls():
             # Handle file drops
             urls = event.mimeData().urls()
             for url in urls:
                 file_path = url.toLocalFile()
-                if file_path.endswith('.json'):
+                if os.path.splitext(file_path)[1].lower() in _DROP_EXTENSIONS:
                     # Load picker file
                     pass
             event.acceptProposedAction()
         else:
             event.ignore()
             
-    def drawForeground(self, painter, rect):
-        """Draw foreground elements (grid, etc.)"""
-        super(EnhancedCanvas, self).drawForeground(painter, rect)
+    def drawBackground(self, painter, rect):
+        """Draw background elements (grid)"""
+        super(EnhancedCanvas, self).drawBackground(painter, rect)
         
-        # Draw grid if visible
+        # The grid sits behind the items, so it belongs to the background
         if self._grid_visible:
             self._draw_grid(painter, rect)
             
+    def drawForeground(self, painter, rect):
+        """Draw foreground elements"""
+        super(EnhancedCanvas, self).drawForeground(painter, rect)
+        
         # Draw selection indicators
         self._draw_selection_indicators(painter, rect)
         
     def _draw_grid(self, painter, rect):
         """Draw grid lines"""
-        transform = self.viewport_manager.get_viewport_transform()
-        viewport_rect = QtCore.QRectF(self.viewport().rect())
-        
-        vertical_lines, horizontal_lines = self.grid_system.get_grid_lines(viewport_rect, transform)
+        # The painter is already in scene coordinates, so lines are built
+        # for the exposed scene rect with an identity transform
+        vertical_lines, horizontal_lines = self.grid_system.get_grid_lines(rect, QtGui.QTransform())
         
-        # Set grid pen
-        grid_color = QtGui.QColor(68, 68, 68, 128)  # Semi-transparent gray
-        grid_pen = QtGui.QPen(grid_color, 1, QtCore.Qt.DotLine)
-        painter.setPen(grid_pen)
+        painter.setPen(self._grid_pen)
         
-        # Draw vertical lines
-        for start_point, end_point in vertical_lines:
-            painter.drawLine(start_point, end_point)
-            
-        # Draw horizontal lines
-        for start_point, end_point in horizontal_lines:
-            painter.drawLine(start_point, end_point)
+        # One call per orientation
+        if vertical_lines:
+            painter.drawLines(vertical_lines)
+        if horizontal_lines:
+            painter.drawLines(horizontal_lines)
             
     def _draw_selection_indicators(self, painter, rect):
         """Draw additional selection indicators"""
-        # This could draw additional selection UI elements
+        # This could draw additional selection UI elements. Per-item
+        # overlays should only visit items in the exposed rect, e.g.
+        # self.get_items_in_rect(rect, QtCore.Qt.AscendingOrder), never
+        # the whole scene
         pass
         
     def create_item(self, item_type, position=None):
         """Create new item of specified type"""
         if position is None:
-            position = self.mapToScene(self.viewport().rect().center())
+            position = QtCore.QPointF(self._viewport_scene_center)
             
-        # Import item classes as needed
-        item = None
-        
-        try:
-            if item_type == 'rectangle':
-                from ..items.rectangle import RectangleItem
-                item = RectangleItem()
-            elif item_type == 'round_rectangle':
-                from ..items.button import ButtonItem
-                item = ButtonItem()
-                item.set_shape('round_rectangle')
-            elif item_type == 'circle':
-                from ..items.button import ButtonItem  
-                item = ButtonItem()
-                item.set_shape('circle')
-            elif item_type == 'polygon':
-                from ..items.polygon import PolygonItem
-                item = PolygonItem()
-            elif item_type == 'checkbox':
-                from ..items.checkbox import CheckboxItem
-                item = CheckboxItem()
-            elif item_type == 'slider':
-                from ..items.slider import SliderItem
-                item = SliderItem()
-            elif item_type == 'radius_button':
-                from ..items.radius_button import RadiusButtonItem
-                item = RadiusButtonItem()
-            elif item_type == 'pose_button':
-                from ..items.pose_button import PoseButtonItem
-                item = PoseButtonItem()
-            elif item_type == 'text':
-                from ..items.text_item import TextItem
-                item = TextItem()
-            else:
-                print(f"Unknown item type: {item_type}")
-                return None
-                
-            if item:
-                self.add_item(item, position)
-                # Select the new item
-                self.clear_selection()
-                self.selection_manager.select_item(item)
-                
-            return item
+        spec = _ITEM_TYPES.get(item_type)
+        if spec is None:
+            print(f"Unknown item type: {item_type}")
+            return None
             
+        try:
+            item = _get_item_class(item_type)()
         except ImportError as e:
             print(f"Error creating item {item_type}: {e}")
             return None
             
+        shape = spec[2]
+        if shape:
+            item.set_shape(shape)
+            
+        self.add_item(item, position)
+        # Select the new item; replaces the current selection
+        self.selection_manager.select_item(item)
+        
+        return item
+        
     def get_canvas_info(self):
         """Get canvas information"""
         return {
-            'total_items': len(self.get_all_items()),
+            'total_items': len(self._items),
             'selected_items': len(self.get_selected_items()),
             'zoom_factor': self.get_zoom_factor(),
             'edit_mode': self._edit_mode,
@@ -658,17 +878,19 @@ class EnhancedCanvas(QtWidgets.QGraphicsView):
                 # Use current viewport size
                 size = self.viewport().size()
                 
-            # Create pixmap
-            pixmap = QtGui.QPixmap(size)
-            pixmap.fill(self.backgroundBrush().color())
+            # Render straight into a QImage; saving a QPixmap converts it to
+            # a QImage first, holding two full-size copies at once.
+            # Premultiplied ARGB is the raster engine's native format
+            image = QtGui.QImage(size, QtGui.QImage.Format_ARGB32_Premultiplied)
+            image.fill(self.backgroundBrush().color())
             
             # Render scene
-            painter = QtGui.QPainter(pixmap)
+            painter = QtGui.QPainter(image)
             self.render(painter)
             painter.end()
             
             # Save image
-            return pixmap.save(file_path)
+            return image.save(file_path)
             
         except Exception as e:
             print(f"Error exporting canvas image: {e}")